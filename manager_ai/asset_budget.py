@@ -0,0 +1,369 @@
+import os
+import re
+import io
+import sys
+import json
+import hashlib
+
+try:
+    from PIL import Image
+except ImportError:  # only needed for --fix
+    Image = None
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)              # site
+PUBLIC_DIR = os.path.join(PROJECT_ROOT, "public")
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+APP_DIR = os.path.join(SRC_DIR, "app")
+INDEX_FILE = os.path.join(BASE_DIR, "asset_index.json")
+# next-pwa precaches everything in public/ except public/noprecache/**, so
+# generated variants live there and only cost bytes when a page asks for them
+VARIANT_DIR = os.path.join(PUBLIC_DIR, "noprecache", "variants")
+
+# Budgets (kB on disk, i.e. what the browser downloads for static files)
+ASSET_BUDGET_KB = float(os.getenv("ASSET_BUDGET_KB", "200"))          # per referenced asset
+TOTAL_BUDGET_KB = float(os.getenv("ASSET_TOTAL_BUDGET_KB", "1024"))   # all of public/
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico')
+RASTER_FORMATS = ('png', 'jpeg', 'gif')      # formats --fix re-encodes
+RESPONSIVE_WIDTHS = (640, 1080, 1920)        # srcset widths, as in next/image deviceSizes
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+MIN_SAVING = 0.10                            # rewrite an original only if it shrinks by 10%+
+
+# Next.js file-convention metadata images (src/app/icon.png etc.) are served
+# without being referenced anywhere
+METADATA_IMAGE = re.compile(r'^(icon|apple-icon|favicon|opengraph-image|twitter-image)\d*\.\w+$')
+# "/images/foo.png", url(/icons/x.svg), href="/og.jpg" - root-relative paths only
+ASSET_REF = re.compile(r'(?<![\w:/.])(/[\w\-./@%]+\.(?:png|jpe?g|gif|webp|avif|svg|ico))\b', re.IGNORECASE)
+USAGE_EXTS = ('.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.mdx', '.json', '.html')
+# Build output in public/ lists every file (precache manifest); not a real usage
+GENERATED_PUBLIC = re.compile(r'^(sw|workbox-[\w]+|fallback-[\w]+)\.js$')
+
+# --- Dimensions (header parsing, no Pillow needed) ---------------------------
+
+def _le(data, start, length):
+    return int.from_bytes(data[start:start + length], 'little')
+
+def _be(data, start, length):
+    return int.from_bytes(data[start:start + length], 'big')
+
+def image_info(data):
+    """(format, width, height) from the file header; width/height None if unknown."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return "png", _be(data, 16, 4), _be(data, 20, 4)
+    if data[:2] == b'\xff\xd8':
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in (0xD8, 0x01, 0xFF) or 0xD0 <= marker <= 0xD7:
+                i += 1 if marker == 0xFF else 2
+                continue
+            # SOFn frames carry the size; C4/C8/CC are other tables
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                return "jpeg", _be(data, i + 7, 2), _be(data, i + 5, 2)
+            i += 2 + _be(data, i + 2, 2)
+        return "jpeg", None, None
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return "gif", _le(data, 6, 2), _le(data, 8, 2)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            return "webp", _le(data, 26, 2) & 0x3FFF, _le(data, 28, 2) & 0x3FFF
+        if chunk == b'VP8L':
+            bits = _le(data, 21, 4)
+            return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            return "webp", _le(data, 24, 3) + 1, _le(data, 27, 3) + 1
+        return "webp", None, None
+    if data[:4] == b'\x00\x00\x01\x00':
+        # ICO: first directory entry, 0 means 256
+        return "ico", data[6] or 256, data[7] or 256
+    head = data[:2048].decode('utf-8', errors='ignore')
+    svg = re.search(r'<svg\b[^>]*>', head)
+    if svg:
+        tag = svg.group(0)
+        width = re.search(r'\bwidth=["\']([\d.]+)(?:px)?["\']', tag)
+        height = re.search(r'\bheight=["\']([\d.]+)(?:px)?["\']', tag)
+        if width and height:
+            return "svg", round(float(width.group(1))), round(float(height.group(1)))
+        view_box = re.search(r'\bviewBox=["\'][\d.\-]+[\s,]+[\d.\-]+[\s,]+([\d.]+)[\s,]+([\d.]+)', tag)
+        if view_box:
+            return "svg", round(float(view_box.group(1))), round(float(view_box.group(2)))
+        return "svg", None, None
+    return "unknown", None, None
+
+# --- Index --------------------------------------------------------------------
+
+def load_index():
+    if not os.path.exists(INDEX_FILE):
+        return {"files": {}, "processed": {}}
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"files": {}, "processed": {}}
+
+def save_index(index):
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, INDEX_FILE)
+
+def asset_paths():
+    """Yield (absolute path, kind). kind: public (served from /), metadata
+    (src/app icon conventions) or repo (root screenshots, never served)."""
+    for root, dirs, files in os.walk(PUBLIC_DIR):
+        if os.path.abspath(root).startswith(VARIANT_DIR):
+            continue
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTS):
+                yield os.path.join(root, name), "public"
+    for root, dirs, files in os.walk(APP_DIR):
+        for name in sorted(files):
+            if METADATA_IMAGE.match(name):
+                yield os.path.join(root, name), "metadata"
+    for name in sorted(os.listdir(PROJECT_ROOT)):
+        if name.lower().endswith('.png'):
+            yield os.path.join(PROJECT_ROOT, name), "repo"
+
+def index_assets(index):
+    """Hash and measure every asset. Files whose size and mtime are unchanged
+    reuse their cached entry, so reruns only read what changed."""
+    files = {}
+    for path, kind in asset_paths():
+        rel = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+        stat = os.stat(path)
+        cached = index["files"].get(rel)
+        if cached and cached["bytes"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            files[rel] = dict(cached, kind=kind)
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        fmt, width, height = image_info(data)
+        files[rel] = {
+            "kind": kind,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "format": fmt,
+            "width": width,
+            "height": height,
+        }
+    index["files"] = files
+    return files
+
+def url_for(rel):
+    """The URL a public/ file is served at."""
+    return "/" + rel[len("public/"):] if rel.startswith("public/") else None
+
+def declared_sizes():
+    """{url: (width, height)} for icons whose size manifest.json declares."""
+    manifest_path = os.path.join(PUBLIC_DIR, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    sizes = {}
+    for icon in manifest.get("icons", []) + manifest.get("screenshots", []):
+        match = re.match(r'(\d+)x(\d+)', icon.get("sizes", ""))
+        if match and icon.get("src"):
+            sizes[icon["src"]] = (int(match.group(1)), int(match.group(2)))
+    return sizes
+
+# --- Usages -------------------------------------------------------------------
+
+def find_usages():
+    """Map every root-relative image URL referenced in src/ (and public/ json/html)
+    to the places that reference it: {url: ["src/app/layout.js:79", ...]}."""
+    usages = {}
+    roots = [(SRC_DIR, True), (PUBLIC_DIR, False)]
+    for top, recursive in roots:
+        for root, dirs, files in os.walk(top):
+            if not recursive:
+                dirs[:] = []
+            for name in files:
+                if not name.endswith(USAGE_EXTS) or (top == PUBLIC_DIR and GENERATED_PUBLIC.match(name)):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        text = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                rel = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+                for m in ASSET_REF.finditer(text):
+                    url = m.group(1).split("?")[0]
+                    usages.setdefault(url, []).append(f"{rel}:{text.count(chr(10), 0, m.start()) + 1}")
+    return usages
+
+# --- Budgets ------------------------------------------------------------------
+
+def check_budgets(files, usages, declared):
+    """Returns (errors, warnings, served_total_bytes)."""
+    errors, warnings = [], []
+    served_total = 0
+    for rel, info in sorted(files.items(), key=lambda item: -item[1]["bytes"]):
+        kb = info["bytes"] / 1024
+        dims = f"{info['width']}x{info['height']}" if info["width"] else "?x?"
+        ext = os.path.splitext(rel)[1].lower().lstrip(".").replace("jpg", "jpeg")
+        if info["format"] in RASTER_FORMATS + ("webp",) and ext != info["format"]:
+            warnings.append(f"⚠️  {rel}: contains {info['format'].upper()} data despite the .{ext} extension")
+        size = declared.get(url_for(rel))
+        if size and info["width"] and (info["width"], info["height"]) != size:
+            warnings.append(f"⚠️  {rel}: is {dims} but manifest.json declares {size[0]}x{size[1]}")
+        if info["kind"] == "repo":
+            if kb > ASSET_BUDGET_KB:
+                warnings.append(f"⚠️  {rel}: {kb:.0f} kB screenshot in the repository root (not served)")
+            continue
+        served_total += info["bytes"]
+        if info["kind"] == "metadata":
+            used_by = ["Next.js metadata file"]
+        else:
+            used_by = usages.get(url_for(rel), [])
+        if kb <= ASSET_BUDGET_KB:
+            continue
+        if not used_by:
+            warnings.append(f"⚠️  {rel}: {kb:.0f} kB ({dims}) is over budget but not referenced in src/")
+            continue
+        errors.append(
+            f"❌ {url_for(rel) or rel}: {kb:.0f} kB ({info['format']} {dims}) exceeds {ASSET_BUDGET_KB:g} kB; "
+            f"used in {', '.join(used_by[:3])}{' …' if len(used_by) > 3 else ''}"
+        )
+
+    if served_total / 1024 > TOTAL_BUDGET_KB:
+        errors.append(f"❌ Total served assets {served_total / 1024:.0f} kB exceed {TOTAL_BUDGET_KB:g} kB")
+
+    known = {url_for(rel) for rel in files if url_for(rel)}
+    variant_prefix = "/" + os.path.relpath(VARIANT_DIR, PUBLIC_DIR).replace(os.sep, "/") + "/"
+    for url, places in sorted(usages.items()):
+        if url not in known and not url.startswith(variant_prefix) and not url.startswith("/_next/"):
+            warnings.append(f"⚠️  {url} is referenced but missing from public/ ({', '.join(places[:3])})")
+    return errors, warnings, served_total
+
+# --- --fix: optimized and responsive variants ---------------------------------
+
+def _encode(img, fmt, **options):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def optimize_asset(rel, info, declared_size=None):
+    """Re-encode the original in place when that saves MIN_SAVING (downscaling
+    to the size manifest.json declares, if it is larger), then write WebP
+    variants of public/ images at each RESPONSIVE_WIDTHS below the image width
+    (plus full width).
+    Returns (new original bytes or None, [variant rel paths])."""
+    path = os.path.join(PROJECT_ROOT, rel)
+    with Image.open(path) as img:
+        if getattr(img, "is_animated", False):
+            return None, []
+        img.load()
+        if declared_size and declared_size[0] < img.size[0]:
+            img = img.resize(declared_size, Image.LANCZOS)
+        if info["format"] == "png":
+            optimized = _encode(img, "PNG", optimize=True)
+        elif info["format"] == "jpeg":
+            optimized = _encode(img.convert("RGB"), "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        else:
+            optimized = None
+
+        new_bytes = None
+        if optimized and len(optimized) <= info["bytes"] * (1 - MIN_SAVING):
+            _write(path, optimized)
+            new_bytes = len(optimized)
+
+        variants = []
+        width, height = img.size
+        if info["kind"] != "public" or width < RESPONSIVE_WIDTHS[0]:
+            # Icons and small images already come in the sizes they are used at
+            return new_bytes, variants
+        stem = os.path.splitext(rel[len("public/"):])[0]
+        source = img if img.mode in ("RGB", "RGBA") else img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "P") else "RGB")
+        for target in [w for w in RESPONSIVE_WIDTHS if w < width] + [width]:
+            resized = source if target == width else source.resize((target, round(height * target / width)), Image.LANCZOS)
+            out = os.path.join(VARIANT_DIR, f"{stem}-{target}w.webp")
+            _write(out, _encode(resized, "WEBP", quality=WEBP_QUALITY, method=6))
+            variants.append(os.path.relpath(out, PROJECT_ROOT).replace(os.sep, "/"))
+    return new_bytes, variants
+
+def fix_assets(files, index):
+    """Generate variants for served raster assets, skipping any whose content
+    hash was already processed and whose outputs still exist."""
+    if Image is None:
+        print("⚠️  Pillow is not installed (pip install Pillow); cannot generate variants.")
+        return 0
+
+    processed = index.setdefault("processed", {})
+    declared = declared_sizes()
+    fixed = 0
+    for rel, info in sorted(files.items()):
+        if info["kind"] == "repo" or info["format"] not in RASTER_FORMATS:
+            continue
+        done = processed.get(info["sha256"])
+        if done and all(os.path.exists(os.path.join(PROJECT_ROOT, v)) for v in done["variants"]):
+            continue
+
+        print(f"   🩹 Optimizing {rel} ({info['bytes'] // 1024} kB)...")
+        try:
+            new_bytes, variants = optimize_asset(rel, info, declared.get(url_for(rel)))
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  {rel}: {e}")
+            continue
+        if new_bytes is not None:
+            print(f"      {info['bytes'] // 1024} → {new_bytes // 1024} kB in place")
+        for variant in variants:
+            print(f"      + /{os.path.relpath(os.path.join(PROJECT_ROOT, variant), PUBLIC_DIR).replace(os.sep, '/')}")
+
+        # Key by the hash of what is on disk now, so the rewritten original is not re-encoded
+        with open(os.path.join(PROJECT_ROOT, rel), 'rb') as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        processed[sha] = {"source": rel, "variants": variants}
+        fixed += 1
+    return fixed
+
+def check_assets(auto_fix=False):
+    index = load_index()
+    files = index_assets(index)
+    if auto_fix:
+        fixed = fix_assets(files, index)
+        if fixed:
+            print(f"\n✨ Optimized {fixed} assets.")
+            files = index_assets(index)
+    save_index(index)
+
+    usages = find_usages()
+    errors, warnings, served_total = check_budgets(files, usages, declared_sizes())
+
+    served = [info for info in files.values() if info["kind"] != "repo"]
+    print(f"🖼️  {len(served)} served assets, {served_total / 1024:.0f} kB total "
+          f"(budget {TOTAL_BUDGET_KB:g} kB, {ASSET_BUDGET_KB:g} kB per asset).")
+    for warning in warnings:
+        print(warning)
+    if errors:
+        print("\n🚨 Asset Budget Check Failed:")
+        for error in errors:
+            print(error)
+        if not auto_fix:
+            print("\nℹ️  Run `python manager_ai/asset_budget.py --fix` and commit the re-encoded images and variants.")
+        return 1
+    print("\n✅ Assets within budget.")
+    return 0
+
+if __name__ == "__main__":
+    auto_fix = "--fix" in sys.argv
+    exit(check_assets(auto_fix))
@@ -1,31 +1,27 @@
 import logging
-import sys
 import os
-import discord
-import requests
+import re
+import json
 import asyncio
-import subprocess
-import logging
-import sys
-import os
 import discord
 import requests
-import asyncio
-import subprocess
-import re
 from github import Github, Auth
 from dotenv import load_dotenv
-
-# Configure Logging to show process in terminal
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+import review_state
+import github_graphql
+from pr_worktrees import WorktreePool
+from leases import Lease, open_store, store_call, WORKER_ID
+from tracing import setup_logging, span
+
+# Configure Logging to show process in terminal. Records go through a queue
+# listener thread (console + rotating spans.jsonl), so the event loop never
+# blocks on stdout or disk.
+setup_logging()
 logger = logging.getLogger("ManagerAI")
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)              # site
+
 # Load environment variables
 load_dotenv()
 
@@ -34,6 +30,33 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 REPO_NAME = os.getenv("REPO_NAME")
 
+def parse_repos(value):
+    """REPOS=owner/a=/path/to/a,owner/b -> {"owner/a": "/path/to/a", "owner/b": None}.
+    Repositories without a local checkout get PR reviews but no health cycle."""
+    repos = {}
+    for entry in filter(None, (e.strip() for e in value.split(","))):
+        name, _, path = entry.partition("=")
+        repos[name.strip()] = os.path.abspath(path.strip()) if path.strip() else None
+    return repos
+
+# Defaults to the single REPO_NAME, checked out at PROJECT_ROOT
+REPOS = parse_repos(os.getenv("REPOS", "")) or parse_repos(f"{REPO_NAME}={PROJECT_ROOT}" if REPO_NAME else "")
+DEFAULT_REPO = next(iter(REPOS), REPO_NAME)
+
+def has_health_suite(path):
+    """HEALTH_CHECKS are this project's own scripts (appwrite.json, functions/,
+    src/, the Next build), so they only mean something in a checkout of it."""
+    return os.path.isfile(os.path.join(path, os.path.relpath(BASE_DIR, PROJECT_ROOT), "bot.py"))
+
+# Checkouts of other projects get PR reviews only
+HEALTH_REPOS = {name: path for name, path in REPOS.items() if path and has_health_suite(path)}
+# Pre-merge verification of each PR head in its own git worktree
+VERIFY_PRS_IN_WORKTREES = os.getenv("VERIFY_PRS_IN_WORKTREES", "").lower() in ("1", "true", "yes")
+
+HEALTH_INTERVAL = 1800
+# How long a finished review of one head SHA stops other workers from repeating it
+PR_DONE_TTL = int(os.getenv("PR_DONE_TTL", str(7 * 24 * 3600)))
+
 # Appwrite & Code Review System Prompt
 # Appwrite & Code Review System Prompt
 SYSTEM_PROMPT_TASK = """
@@ -91,6 +114,14 @@ intents = discord.Intents.default()
 intents.message_content = True
 client = discord.Client(intents=intents)
 
+# Shared across PR sub-bots so the worktree cap applies to the whole swarm.
+# Worktrees are made from this checkout, so only its repository is verified.
+worktree_pool = WorktreePool() if VERIFY_PRS_IN_WORKTREES else None
+
+# Coordinates bot instances: each PR review and each repository's health cycle
+# is owned by whichever worker holds its lease (see leases.py)
+lease_store = open_store()
+
 # OpenRouter / Gemini API Call
 def call_openrouter_sync(system_prompt, user_content):
     headers = {
@@ -116,14 +147,15 @@ def call_openrouter_sync(system_prompt, user_content):
 
 async def call_openrouter(system_prompt, user_prompt):
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, call_openrouter_sync, system_prompt, user_prompt)
+    with span("llm_call"):
+        return await loop.run_in_executor(None, call_openrouter_sync, system_prompt, user_prompt)
 
 # GitHub Integration
-def create_github_issue(title, body):
+def create_github_issue(title, body, repo_name=None):
     try:
         auth = Auth.Token(GITHUB_TOKEN)
         g = Github(auth=auth)
-        repo = g.get_repo(REPO_NAME)
+        repo = g.get_repo(repo_name or DEFAULT_REPO)
         # Injection for Google Jules
         if "@jules" not in body:
             body = f"@jules\n\n{body}"
@@ -135,57 +167,93 @@ def create_github_issue(title, body):
 
 async def create_issue_comment_async(pr, body):
     loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, pr.create_issue_comment, body)
-
-async def process_pr(pr, repo):
+    await loop.run_in_executor(None, github_graphql.add_comment, GITHUB_TOKEN, pr["id"], body)
+
+class MergeBlocked(RuntimeError):
+    """The merge cannot succeed until the head changes (conflicts, failed verification)."""
+
+async def process_pr(pr, force=False):
+    """Review one PR from the record prefetched by github_graphql.fetch_open_prs,
+    unless another worker owns it or already reviewed this head SHA."""
+    done_key = f"pr:{pr['repo']}#{pr['number']}@{pr['head_sha']}"
+    if not force and await store_call(lease_store.holder, done_key):
+        return ""
+
+    async with Lease(lease_store, f"pr:{pr['repo']}#{pr['number']}") as lease:
+        if not lease.acquired:
+            logger.info(f"   - 🔒 [Sub-Bot-PR#{pr['number']}] Owned by another worker. Skipping.")
+            return ""
+        # Another worker may have finished this head between the check above and
+        # taking the lease
+        if not force and await store_call(lease_store.holder, done_key):
+            return ""
+        with span("pr", repo=pr["repo"], number=pr["number"], head=pr["head_sha"][:7]):
+            result = await _process_pr(pr, lease)
+        # Failed merges do not count as up to date: no marker, so any worker retries them
+        if review_state.is_up_to_date(pr["repo"], pr["number"], pr["head_sha"]):
+            await store_call(lease_store.acquire, done_key, WORKER_ID, PR_DONE_TTL)
+        return result
+
+async def _process_pr(pr, lease):
     review_log = []
+    merge_outcome = "skipped"
+    number = pr["number"]
+    loop = asyncio.get_running_loop()
     # AUTO-UNDRAFT: If PR is a Draft, mark it Ready for Review immediately
-    if pr.draft:
+    if pr["draft"]:
         try:
-            logger.info(f"🔓 [Sub-Bot-PR#{pr.number}] Draft detected. Converting to 'Ready'...")
-            pr.edit(draft=False)
-            logger.info(f"   ✅ [Sub-Bot-PR#{pr.number}] is now Ready.")
-        except TypeError:
-             # Fallback for older PyGithub versions or API limitation
-             logger.warning(f"   ⚠️ [Sub-Bot-PR#{pr.number}] PyGithub 'edit' failed. Trying raw API...")
-             try:
-                 # Manual PATCH request
-                 headers = {"Authorization": f"token {GITHUB_TOKEN}", "Accept": "application/vnd.github.v3+json"}
-                 requests.patch(f"https://api.github.com/repos/{REPO_NAME}/pulls/{pr.number}", json={"draft": False}, headers=headers)
-                 logger.info(f"   ✅ [Sub-Bot-PR#{pr.number}] undrafted via Raw API.")
-             except Exception as raw_err:
-                 logger.error(f"   ❌ [Sub-Bot-PR#{pr.number}] Raw Undraft Failed: {raw_err}")
+            logger.info(f"🔓 [Sub-Bot-PR#{number}] Draft detected. Converting to 'Ready'...")
+            await loop.run_in_executor(None, github_graphql.mark_ready_for_review, GITHUB_TOKEN, pr["id"])
+            logger.info(f"   ✅ [Sub-Bot-PR#{number}] is now Ready.")
         except Exception as draft_err:
-            logger.error(f"   ❌ [Sub-Bot-PR#{pr.number}] Undraft Failed: {draft_err}")
+            logger.error(f"   ❌ [Sub-Bot-PR#{number}] Undraft Failed: {draft_err}")
 
     # Getting diff
     try:
-        diff_url = pr.diff_url
-        diff_resp = requests.get(diff_url)
+        with span("diff_fetch"):
+            diff_resp = await loop.run_in_executor(None, requests.get, pr["diff_url"])
         diff_content = diff_resp.text[:6000] # truncate
         
         # AI Review (Async)
-        logger.info(f"🤖 [Sub-Bot-PR#{pr.number}] Reviewing Code...")
-        ai_review = await call_openrouter(SYSTEM_PROMPT_REVIEW, f"PR Title: {pr.title}\n\nDiff:\n{diff_content}")
-        review_log.append(f"**PR #{pr.number}: {pr.title}**\n{pr.html_url}\n\n{ai_review}")
+        logger.info(f"🤖 [Sub-Bot-PR#{number}] Reviewing Code...")
+        ai_review = await call_openrouter(SYSTEM_PROMPT_REVIEW, f"PR Title: {pr['title']}\n\nDiff:\n{diff_content}")
+        review_log.append(f"**PR #{number}: {pr['title']}**\n{pr['url']}\n\n{ai_review}")
         
         # ZERO HUMAN: Auto-Merge Logic
         # Regex to match "Safe to Merge: YES" case-insensitive
         if re.search(r"Safe to Merge:\s*YES", ai_review, re.IGNORECASE):
             try:
-                logger.info(f"🚀 [Sub-Bot-PR#{pr.number}] Auto-Merging (Approved by AI)")
-                pr.merge(merge_method='squash', commit_message=f"Auto-merged by Manager AI based on review: {ai_review[:50]}...")
-                review_log.append(f"✅ **AUTO-MERGED PR #{pr.number}** 🚀")
+                if pr["mergeable"] == "CONFLICTING":
+                    raise MergeBlocked(f"PR has merge conflicts ({pr['merge_state']})")
+                if worktree_pool and REPOS.get(pr["repo"]) == PROJECT_ROOT:
+                    with span("worktree_verify"):
+                        passed, failures = await worktree_pool.verify(number, pr["head_sha"])
+                    if not passed:
+                        raise MergeBlocked(f"Pre-merge verification failed: {', '.join(failures)}")
+                    logger.info(f"   ✅ [Sub-Bot-PR#{number}] Worktree verification passed.")
+                if lease.lost:
+                    raise RuntimeError("Lease lost to another worker")
+                logger.info(f"🚀 [Sub-Bot-PR#{number}] Auto-Merging (Approved by AI)")
+                with span("merge"):
+                    await loop.run_in_executor(
+                        None, github_graphql.merge_pull_request, GITHUB_TOKEN, pr["id"],
+                        f"Auto-merged by Manager AI based on review: {ai_review[:50]}...", pr["head_sha"]
+                    )
+                review_log.append(f"✅ **AUTO-MERGED PR #{number}** 🚀")
+                merge_outcome = "merged"
             except Exception as merge_error:
-                logger.error(f"❌ [Sub-Bot-PR#{pr.number}] Merge Failed: {merge_error}")
+                logger.error(f"❌ [Sub-Bot-PR#{number}] Merge Failed: {merge_error}")
                 review_log.append(f"❌ Auto-Merge Failed: {merge_error}")
+                # Blocked stays blocked for this head; anything else (GitHub 5xx,
+                # checks pending, network) is retried next cycle
+                merge_outcome = "blocked" if isinstance(merge_error, MergeBlocked) else "failed"
         else:
             # Feedback Loop: Post comment if not merging
             try:
-                comments = list(pr.get_issue_comments())
+                # Only the last few comments are prefetched; that is all this heuristic needs
                 last_bot_comment = None
-                for comment in reversed(comments):
-                    if "Manager AI" in comment.body or "Analysis Result" in comment.body:
+                for comment in reversed(pr["comments"]):
+                    if "Manager AI" in comment["body"] or "Analysis Result" in comment["body"]:
                         last_bot_comment = comment
                         break
                 
@@ -196,7 +264,7 @@ async def process_pr(pr, repo):
                      # For now, simplistic: if we reviewed already, don't spam unless different?
                      # Actually, simplest is: One review per commit? 
                      # Let's stick to "Only comment if last comment is not ours"
-                     if last_bot_comment.user.login == 'landsalelk-manager-ai': # or whatever bot name
+                     if last_bot_comment["author"] == 'landsalelk-manager-ai': # or whatever bot name
                          should_comment = False
 
                 # Force comment for now to prove it works, but maybe check history
@@ -207,176 +275,208 @@ async def process_pr(pr, repo):
                 
                 if should_comment and False: # DISABLED: Auto-commenting to prevent spam
                     await create_issue_comment_async(pr, f"## 🤖 Manager AI Analysis Result\n\n{ai_review}")
-                    logger.info(f"   - 💬 [Sub-Bot-PR#{pr.number}] Commented on PR.")
+                    logger.info(f"   - 💬 [Sub-Bot-PR#{number}] Commented on PR.")
             except Exception as e:
-                logger.error(f"   ❌ [Sub-Bot-PR#{pr.number}] Comment Failed: {e}")
+                logger.error(f"   ❌ [Sub-Bot-PR#{number}] Comment Failed: {e}")
 
             # REJECTION HANDLER: Create Task for Jules
             if "Safe to Merge: NO" in ai_review:
                 try:
-                    logger.info(f"   - 🔨 [Sub-Bot-PR#{pr.number}] Creating Fix Task for Jules...")
-                    task_body = f"The PR #{pr.number} was rejected by Manager AI.\n\nReason:\n{ai_review}\n\nPlease fix the issues and push updates."
-                    create_github_issue(f"Fix Rejected PR #{pr.number}: {pr.title}", task_body)
-                    logger.info(f"     ✅ [Sub-Bot-PR#{pr.number}] Task Created.")
+                    logger.info(f"   - 🔨 [Sub-Bot-PR#{number}] Creating Fix Task for Jules...")
+                    task_body = f"The PR #{number} was rejected by Manager AI.\n\nReason:\n{ai_review}\n\nPlease fix the issues and push updates."
+                    create_github_issue(f"Fix Rejected PR #{number}: {pr['title']}", task_body, pr["repo"])
+                    logger.info(f"     ✅ [Sub-Bot-PR#{number}] Task Created.")
                 except Exception as task_err:
-                     logger.error(f"     ❌ [Sub-Bot-PR#{pr.number}] Task Creation Failed: {task_err}")
+                     logger.error(f"     ❌ [Sub-Bot-PR#{number}] Task Creation Failed: {task_err}")
+
+        # Materialize the outcome so !status can answer without re-reviewing
+        if ai_review != "AI Analysis Failed.":
+            review_state.record_review(pr['repo'], number, pr['title'], pr['url'], pr['head_sha'], ai_review, merge_outcome)
 
     except Exception as e:
-        logger.error(f"❌ [Sub-Bot-PR#{pr.number}] Processing Failed: {e}")
+        logger.error(f"❌ [Sub-Bot-PR#{number}] Processing Failed: {e}")
     
     return "\n".join(review_log)
 
-async def get_open_prs_and_review():
+async def fetch_repo_prs(repo_name):
+    # One paginated GraphQL query instead of per-PR REST round trips
+    loop = asyncio.get_running_loop()
+    pulls = await loop.run_in_executor(None, github_graphql.fetch_open_prs, GITHUB_TOKEN, repo_name)
+    review_state.prune_closed(repo_name, [pr["number"] for pr in pulls])
+    for pr in pulls:
+        pr["repo"] = repo_name
+    return pulls
+
+async def get_open_prs_and_review(force=False):
+    """Review open PRs of every repository. Unless force is set, PRs whose head
+    SHA has not moved since the last materialized review are skipped."""
     try:
-        auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(auth=auth)
-        repo = g.get_repo(REPO_NAME)
-        pulls = list(repo.get_pulls(state='open', sort='created'))
+        per_repo = await asyncio.gather(*(fetch_repo_prs(repo_name) for repo_name in REPOS))
+        pulls = [pr for repo_pulls in per_repo for pr in repo_pulls]
         
         if not pulls:
             return "No open PRs found."
+
+        if not force:
+            state = review_state.load_review_state()
+            stale = [pr for pr in pulls if not review_state.is_up_to_date(pr["repo"], pr["number"], pr["head_sha"], state)]
+            if len(stale) < len(pulls):
+                logger.info(f"   - ⏭️ Skipping {len(pulls) - len(stale)} PRs unchanged since last review.")
+            pulls = stale
+            if not pulls:
+                return "No PR changes since last review."
         
         logger.info(f"🚀 Launching Swarm: {len(pulls)} Sub-Bots for PR Analysis...")
         
-        # Parallel Execution - Swarm Mode
-        tasks = [process_pr(pr, repo) for pr in pulls]
-        results = await asyncio.gather(*tasks)
+        # Parallel Execution - Swarm Mode (PRs owned by other workers come back empty)
+        tasks = [process_pr(pr, force) for pr in pulls]
+        results = [r for r in await asyncio.gather(*tasks) if r]
         
         return "\n\n---\n\n".join(results)
     except Exception as e:
         return f"Error fetching PRs: {str(e)}"
 
 # Health Check Loop
+HEALTH_CHECKS = [
+    {"name": "Appwrite Config", "type": "json", "path": "appwrite.json"},
+    {"name": "Schema Integrity", "type": "cmd", "cmd": "python manager_ai/validate_queries.py"},
+    {"name": "Backend Functions", "type": "cmd", "cmd": "python manager_ai/check_functions.py"},
+    {"name": "Linting", "type": "cmd", "cmd": "npm run lint"},
+    {"name": "Smoke Test", "type": "cmd", "cmd": "python manager_ai/playwright_shards.py"},
+    {"name": "Link Crawl (HTTP)", "type": "cmd", "cmd": "python manager_ai/link_crawler.py"},
+    {"name": "Spider Crawl (Auto-Detect)", "type": "cmd", "cmd": "python manager_ai/playwright_shards.py tests/e2e/spider.spec.js"},
+    # Runs `npm run build` and fails on First Load JS budget/growth regressions
+    {"name": "Build", "type": "cmd", "cmd": "python manager_ai/bundle_size.py"},
+    # Timing-based, so it can flag a noisy regression; after the correctness
+    # checks and the build so a slow cold start never keeps those from running
+    {"name": "Function Cold Start", "type": "cmd", "cmd": "python manager_ai/function_profiler.py"},
+    # The last two are advisory: a failure is reported but does not stop the
+    # suite, so an existing finding in one never hides the other.
+    # Per-asset and total size budgets for public/ images. No self-healing: --fix
+    # rewrites tracked images, which would leave the checkout dirty for git pull.
+    {"name": "Asset Budget", "type": "cmd", "cmd": "python manager_ai/asset_budget.py", "advisory": True},
+    {"name": "Query Patterns (N+1)", "type": "cmd", "cmd": "python manager_ai/check_query_patterns.py", "advisory": True}
+]
+
+async def run_shell(cmd, cwd=PROJECT_ROOT):
+    process = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout, stderr
+
+async def run_check(check, cwd=PROJECT_ROOT):
+    """Run one health check (with self-healing where available) in the checkout
+    at cwd. Returns True if it passed."""
+    logger.info(f"   > Checking {check['name']}...")
+
+    if check['type'] == 'json':
+        # Validate JSON file
+        try:
+            with open(os.path.join(cwd, check['path']), 'r') as f:
+                json.load(f)
+            logger.info(f"     ✅ {check['name']} Passed.")
+            return True
+        except Exception as e:
+            logger.error(f"     ❌ {check['name']} Failed: {e}")
+            error_log = f"Appwrite Configuration Error (appwrite.json): {str(e)}"
+            await report_error_to_jules(error_log)
+            return False
+
+    # Run Command
+    returncode, stdout, stderr = await run_shell(check['cmd'], cwd)
+    if returncode == 0:
+        logger.info(f"     ✅ {check['name']} Passed.")
+        return True
+
+    # SELF-HEALING: If Lint fails, try to fix it automatically
+    if check['name'] == "Linting":
+        logger.info("     🩹 Self-Healing: Attempting to auto-fix lint errors...")
+        with span("self_heal", check=check['name']):
+            await run_shell("npm run lint -- --fix", cwd)
+            # Re-run check after fix
+            returncode, stdout, stderr = await run_shell(check['cmd'], cwd)
+
+    # SELF-HEALING: Backend Functions
+    elif check['name'] == "Backend Functions":
+        logger.info("     🩹 Self-Healing: Attempting to auto-fix Function Configs...")
+        with span("self_heal", check=check['name']):
+            await run_shell("python manager_ai/check_functions.py --fix", cwd)
+            # Re-run check
+            returncode, stdout, stderr = await run_shell(check['cmd'], cwd)
+
+    if returncode != 0:
+        error_log = stderr.decode() + stdout.decode()
+        logger.error(f"     ❌ {check['name']} Failed!")
+        await report_error_to_jules(error_log[-2000:])
+        return False
+    logger.info(f"     ✅ {check['name']} Passed (after Self-Healing).")
+    return True
+
+async def run_repo_health(repo_name, path):
+    # 2. Sync Codebase (Git Pull)
+    logger.info(f"⬇️ Syncing {repo_name} (git pull)...")
+    with span("git_pull"):
+        returncode, p_out, p_err = await run_shell("git pull", path)
+    if returncode == 0:
+        logger.info(f"   - ✅ Codebase Synced: {p_out.decode().strip()[:50]}...")
+    else:
+        logger.warning(f"   - ⚠️ Git Pull Issue: {p_err.decode().strip()[:100]}...")
+
+    # 3. Health Check Suite
+    logger.info(f"🩺 Running Health Check Suite for {repo_name}...")
+    advisory_failures = []
+    for check in HEALTH_CHECKS:
+        with span("health_check", check=check['name']) as attrs:
+            attrs["passed"] = await run_check(check, path)
+        if attrs["passed"]:
+            continue
+        if not check.get("advisory"):
+            return # Stop on first failure to simple fix order
+        advisory_failures.append(check['name'])
+
+    if advisory_failures:
+        logger.warning(f"⚠️ {repo_name} healthy apart from advisory checks: {', '.join(advisory_failures)}")
+    else:
+        logger.info(f"✅ All Systems Nominal ({repo_name}).")
+
+async def run_health_cycle():
+    logger.info("⏳ Starting scheduled health check...")
+
+    # 1. PR Reviews & Auto-Merge (Function is now Async)
+    with span("pr_reviews"):
+        review_summary = await get_open_prs_and_review()
+    if "AUTO-MERGED" in review_summary:
+        logger.info("   - 🚀 PR Merged! Preparing to sync...")
+
+    for repo_name, path in HEALTH_REPOS.items():
+        async with Lease(lease_store, f"health:{repo_name}") as lease:
+            if not lease.acquired:
+                logger.info(f"   - 🔒 Health cycle for {repo_name} is owned by another worker. Skipping.")
+                continue
+            with span("repo_health", repo=repo_name):
+                await run_repo_health(repo_name, path)
+            # Hold the lease until the next cycle is due so other workers skip this one
+            lease.keep(HEALTH_INTERVAL)
+
 async def run_health_check_loop():
     await client.wait_until_ready()
     logger.info("🩺 Autonomous QA Loop Started: Running checks every 10 minutes.")
     
     while True:
-        try:
-            logger.info("⏳ Starting scheduled health check...")
-            
-            # 1. PR Reviews & Auto-Merge (Function is now Async)
-            review_summary = await get_open_prs_and_review()
-            if "AUTO-MERGED" in review_summary:
-                logger.info("   - 🚀 PR Merged! Preparing to sync...")
-            
-            # 2. Sync Codebase (Git Pull)
-            logger.info("⬇️ Syncing Codebase (git pull)...")
-            pull_process = await asyncio.create_subprocess_shell(
-                "git pull",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            )
-            p_out, p_err = await pull_process.communicate()
-            if pull_process.returncode == 0:
-                logger.info(f"   - ✅ Codebase Synced: {p_out.decode().strip()[:50]}...")
-            else:
-                logger.warning(f"   - ⚠️ Git Pull Issue: {p_err.decode().strip()[:100]}...")
-
-            # 3. Health Check Suite
-            logger.info("🩺 Running Health Check Suite...")
-            
-            checks = [
-                {"name": "Appwrite Config", "type": "json", "path": "appwrite.json"},
-                {"name": "Schema Integrity", "type": "cmd", "cmd": "python site/manager_ai/validate_queries.py"},
-                {"name": "Backend Functions", "type": "cmd", "cmd": "python site/manager_ai/check_functions.py"},
-                {"name": "Linting", "type": "cmd", "cmd": "npm run lint"},
-                {"name": "Smoke Test", "type": "cmd", "cmd": "npm run test:e2e"},
-                {"name": "Spider Crawl (Auto-Detect)", "type": "cmd", "cmd": "npx playwright test tests/e2e/spider.spec.js"},
-                {"name": "Build", "type": "cmd", "cmd": "npm run build"}
-            ]
-
-            suite_passed = True
-            
-            for check in checks:
-                if not suite_passed: break # Stop on first failure to simple fix order
-                
-                logger.info(f"   > Checking {check['name']}...")
-                
-                if check['type'] == 'json':
-                    # Validate JSON file
-                    import json
-                    try:
-                        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check['path']), 'r') as f:
-                            json.load(f)
-                        logger.info(f"     ✅ {check['name']} Passed.")
-                    except Exception as e:
-                        suite_passed = False
-                        logger.error(f"     ❌ {check['name']} Failed: {e}")
-                        error_log = f"Appwrite Configuration Error (appwrite.json): {str(e)}"
-                        await report_error_to_jules(error_log)
-                        
-                elif check['type'] == 'cmd':
-                    # Run Command
-                    process = await asyncio.create_subprocess_shell(
-                        check['cmd'],
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                    )
-                    stdout, stderr = await process.communicate()
-                    
-                    if process.returncode != 0:
-                        # SELF-HEALING: If Lint fails, try to fix it automatically
-                        if check['name'] == "Linting":
-                            logger.info("     🩹 Self-Healing: Attempting to auto-fix lint errors...")
-                            fix_process = await asyncio.create_subprocess_shell(
-                                "npm run lint -- --fix",
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                            )
-                            await fix_process.communicate()
-                            
-                            # Re-run check after fix
-                            process = await asyncio.create_subprocess_shell(
-                                check['cmd'],
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                            )
-                            stdout, stderr = await process.communicate()
-                            
-                        # SELF-HEALING: Backend Functions
-                        elif check['name'] == "Backend Functions":
-                             logger.info("     🩹 Self-Healing: Attempting to auto-fix Function Configs...")
-                             fix_process = await asyncio.create_subprocess_shell(
-                                "python site/manager_ai/check_functions.py --fix",
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                             )
-                             await fix_process.communicate()
-                             
-                             # Re-run check
-                             process = await asyncio.create_subprocess_shell(
-                                check['cmd'],
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                            )
-                             stdout, stderr = await process.communicate()
-                        
-                        if process.returncode != 0:
-                            suite_passed = False
-                            error_log = stderr.decode() + stdout.decode()
-                            logger.error(f"     ❌ {check['name']} Failed!")
-                            await report_error_to_jules(error_log[-2000:])
-                        else:
-                            logger.info(f"     ✅ {check['name']} Passed (after Self-Healing).")
-                    else:
-                        logger.info(f"     ✅ {check['name']} Passed.")
-
-            if suite_passed:
-                logger.info("✅ All Systems Nominal.")
-
-        except Exception as e:
-            logger.error(f"Error in autonomous loop: {e}")
+        # One trace per cycle: every PR review and check below is a child span
+        with span("cycle"):
+            try:
+                await run_health_cycle()
+            except Exception as e:
+                logger.error(f"Error in autonomous loop: {e}")
 
         # Wait for 30 MINUTES before next check (Rate Limited Mode)
         # Changed from 30s to prevent runaway GitHub Actions
-        await asyncio.sleep(1800)
+        await asyncio.sleep(HEALTH_INTERVAL)
 
 async def report_error_to_jules(error_snippet):
     logger.info("   - 🧠 Analyzing error with AI...")
@@ -401,7 +501,12 @@ async def report_error_to_jules(error_snippet):
 @client.event
 async def on_ready():
     logger.info(f'✅ Manager AI is ONLINE as {client.user}')
-    logger.info(f'   - Monitoring Repository: {REPO_NAME}')
+    logger.info(f'   - Monitoring Repositories: {", ".join(REPOS) or "(none)"}')
+    logger.info(f'   - Health Cycle: {", ".join(HEALTH_REPOS) or "(none)"}')
+    for repo_name, path in REPOS.items():
+        if path and repo_name not in HEALTH_REPOS:
+            logger.warning(f'   - ⚠️ {path} is not a checkout of this project; {repo_name} gets PR reviews only.')
+    logger.info(f'   - Worker ID: {WORKER_ID}')
     logger.info(f'   - Listening for commands: !task, !status')
     logger.info(f'   - Autonomous Loop: ENABLED')
     
@@ -412,9 +517,14 @@ async def on_ready():
 
 @client.event
 async def on_message(message):
-    if message.author == client.user:
+    if message.author == client.user or not message.content.startswith('!'):
         return
-    elif message.content.startswith('!audit'):
+    # One trace per command
+    with span("command", command=message.content.split(' ', 1)[0]):
+        await handle_command(message)
+
+async def handle_command(message):
+    if message.content.startswith('!audit'):
         await message.channel.send("🕵️ Starting UX/UI Audit... This may take a minute.")
         logger.info("🕵️ User requested manual UX Audit.")
         
@@ -423,10 +533,10 @@ async def on_message(message):
         try:
              # Run the script as a subprocess to keep it clean
             process = await asyncio.create_subprocess_shell(
-                "python site/manager_ai/ux_audit.py",
+                "python manager_ai/ux_audit.py",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                cwd=PROJECT_ROOT
             )
             stdout, stderr = await process.communicate()
             
@@ -455,7 +565,7 @@ async def on_message(message):
         
         # 1. Generate Plan
         logger.info("   - Generating Implementation Plan via OpenRouter...")
-        ai_plan = call_openrouter(SYSTEM_PROMPT_TASK, idea)
+        ai_plan = await call_openrouter(SYSTEM_PROMPT_TASK, idea)
         
         # 2. Create Issue
         logger.info("   - Creating GitHub Issue...")
@@ -472,9 +582,16 @@ async def on_message(message):
         await message.channel.send(embed=embed)
 
     elif message.content.startswith('!status'):
-        logger.info("🔎 Status Check Requested.")
-        await message.channel.send("Checking specific PRs...")
-        review_summary = get_open_prs_and_review()
+        force_refresh = "--refresh" in message.content
+        logger.info(f"🔎 Status Check Requested (refresh={force_refresh}).")
+
+        if force_refresh or not review_state.load_review_state():
+            # Full (or first) run: review every open PR, then render the fresh state
+            await message.channel.send("Re-reviewing open PRs...")
+            await get_open_prs_and_review(force=force_refresh)
+
+        # Served from the state materialized by the background loop
+        review_summary = review_state.render_status()
         
         logger.info("   - sending Review to Discord.")
         if len(review_summary) > 3500: # chunk if massive
@@ -485,12 +602,14 @@ async def on_message(message):
              embed = discord.Embed(title="🔎 Status Check", description="No open Pull Requests found.", color=COLOR_INFO)
              await message.channel.send(embed=embed)
         else:
-             # Basic embedding of the review (parsing this nicely is hard without changing get_open_prs_and_review return type, so we wrap the text)
              embed = discord.Embed(title="🔎 Code Reviews", description=review_summary[:4000], color=COLOR_WARN)
+             embed.set_footer(text="Use !status --refresh to force a full re-review.")
              await message.channel.send(embed=embed)
 
 if __name__ == "__main__":
     if not DISCORD_TOKEN:
         logger.error("❌ DISCORD_TOKEN is not set in .env")
     else:
-        client.run(DISCORD_TOKEN)
+        # Logging is already routed through tracing.setup_logging(); without
+        # log_handler=None discord.py adds a second handler to the root logger
+        client.run(DISCORD_TOKEN, log_handler=None)
@@ -0,0 +1,176 @@
+import os
+import re
+import sys
+import json
+import time
+import subprocess
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)                 # site
+NEXT_DIR = os.path.join(PROJECT_ROOT, ".next")
+# PR worktrees point this at the main checkout's history to compare against it
+HISTORY_FILE = os.getenv("BUNDLE_HISTORY_FILE", os.path.join(BASE_DIR, "bundle_history.json"))
+
+# Budgets (First Load JS, kB as printed by `next build`)
+BUDGET_KB = float(os.getenv("BUNDLE_BUDGET_KB", "350"))        # fail above this
+WARN_KB = float(os.getenv("BUNDLE_WARN_KB", "250"))            # warn above this
+MAX_GROWTH_PCT = float(os.getenv("BUNDLE_MAX_GROWTH_PCT", "10"))
+MIN_GROWTH_KB = 1.0     # ignore rounding noise in the build table
+HISTORY_LIMIT = 100     # commits kept in the time series
+
+# "├ ○ /admin     20.4 kB     260 kB" (shared-chunk lines are indented, so ^ skips them)
+ROUTE_LINE = re.compile(r'^[┌├└]\s+(?:\S\s+)?(/\S*)\s+([\d.]+\s*[kMG]?B)\s+([\d.]+\s*[kMG]?B)\s*$')
+SHARED_LINE = re.compile(r'^\+ First Load JS shared by all\s+([\d.]+\s*[kMG]?B)')
+UNITS = {"B": 1 / 1024, "kB": 1, "MB": 1024, "GB": 1024 * 1024}
+
+def to_kb(size):
+    value, unit = re.match(r'([\d.]+)\s*([kMG]?B)', size).groups()
+    return round(float(value) * UNITS[unit], 2)
+
+def parse_build_output(text):
+    """Parse the "Route (app) … Size / First Load JS" table.
+
+    Returns (routes, shared_kb) where routes maps route -> {"size_kb", "first_load_kb"}.
+    """
+    routes = {}
+    shared_kb = None
+    for line in text.splitlines():
+        match = ROUTE_LINE.match(line)
+        if match:
+            route, size, first_load = match.groups()
+            routes[route] = {"size_kb": to_kb(size), "first_load_kb": to_kb(first_load)}
+            continue
+        match = SHARED_LINE.match(line)
+        if match and shared_kb is None:
+            shared_kb = to_kb(match.group(1))
+    return routes, shared_kb
+
+def parse_manifests():
+    """Raw (uncompressed) JS bytes per app route from .next/app-build-manifest.json."""
+    manifest_path = os.path.join(NEXT_DIR, "app-build-manifest.json")
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        pages = json.load(f).get("pages", {})
+
+    raw_bytes = {}
+    for entry, files in pages.items():
+        if not entry.endswith("/page"):
+            continue
+        route = entry[:-len("/page")] or "/"
+        total = 0
+        for rel in files:
+            path = os.path.join(NEXT_DIR, rel)
+            if rel.endswith(".js") and os.path.exists(path):
+                total += os.path.getsize(path)
+        raw_bytes[route] = total
+    return raw_bytes
+
+def current_commit():
+    try:
+        return subprocess.run(
+            "git rev-parse HEAD", shell=True, cwd=PROJECT_ROOT,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        ).stdout.decode().strip()
+    except subprocess.CalledProcessError:
+        return "unknown"
+
+def load_history():
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    try:
+        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+def last_passing(history, commit):
+    """Baseline for growth checks: the newest build of another commit that passed.
+    Failed builds stay in the series but never become the baseline, so a
+    regression can't be accepted just by rebuilding on top of it."""
+    return next(
+        (entry for entry in reversed(history) if entry["commit"] != commit and entry.get("passed", True)),
+        None
+    )
+
+def record(commit, routes, shared_kb, raw_bytes, passed):
+    """Append this build to the time series. Routes are stored compactly as
+    [size_kb, first_load_kb, raw_js_bytes]."""
+    history = [entry for entry in load_history() if entry["commit"] != commit]
+    history.append({
+        "commit": commit,
+        "timestamp": int(time.time()),
+        "passed": passed,
+        "shared_kb": shared_kb,
+        "routes": {
+            route: [r["size_kb"], r["first_load_kb"], raw_bytes.get(route)]
+            for route, r in routes.items()
+        },
+    })
+    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(history[-HISTORY_LIMIT:], f, separators=(",", ":"))
+
+def compare(routes, baseline):
+    """Check budgets and growth against the previous commit. Returns (errors, warnings)."""
+    errors, warnings = [], []
+    previous = baseline["routes"] if baseline else {}
+    for route, r in sorted(routes.items()):
+        first_load = r["first_load_kb"]
+        if first_load > BUDGET_KB:
+            errors.append(f"❌ {route}: First Load JS {first_load} kB exceeds budget of {BUDGET_KB:g} kB")
+        elif first_load > WARN_KB:
+            warnings.append(f"⚠️  {route}: First Load JS {first_load} kB is above {WARN_KB:g} kB")
+
+        if route in previous:
+            before = previous[route][1]
+            growth = first_load - before
+            if growth >= MIN_GROWTH_KB and before and growth / before * 100 > MAX_GROWTH_PCT:
+                errors.append(
+                    f"❌ {route}: First Load JS grew {before} → {first_load} kB "
+                    f"(+{growth / before * 100:.1f}%, limit {MAX_GROWTH_PCT:g}%) since {baseline['commit'][:7]}"
+                )
+    return errors, warnings
+
+def run_build():
+    print("🏗️  Running npm run build...")
+    result = subprocess.run(
+        "npm run build", shell=True, cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    return result.returncode, result.stdout.decode('utf-8', errors='replace')
+
+if __name__ == "__main__":
+    # Usage: python bundle_size.py [--log build_log.txt] [--no-record]
+    if "--log" in sys.argv:
+        with open(sys.argv[sys.argv.index("--log") + 1], 'r', encoding='utf-8', errors='replace') as f:
+            output = f.read()
+    else:
+        code, output = run_build()
+        if code != 0:
+            print(output[-2000:])
+            print("\n❌ Build Failed.")
+            exit(1)
+
+    routes, shared_kb = parse_build_output(output)
+    if not routes:
+        print("⚠️  No route table found in build output. Skipping bundle analysis.")
+        exit(0)
+
+    commit = current_commit()
+    baseline = last_passing(load_history(), commit)
+    errors, warnings = compare(routes, baseline)
+    # Unmerged PR builds are checked against the history but not added to it
+    if "--no-record" not in sys.argv:
+        record(commit, routes, shared_kb, parse_manifests(), passed=not errors)
+
+    print(f"📦 {len(routes)} routes, shared First Load JS {shared_kb} kB (commit {commit[:7]}).")
+    for warning in warnings:
+        print(warning)
+    if errors:
+        print(f"\n🚨 Bundle Size Regression ({len(errors)} routes):")
+        for error in errors:
+            print(error)
+        exit(1)
+    print("\n✅ Bundle sizes within budget.")
+    exit(0)
@@ -0,0 +1,301 @@
+import os
+import re
+import sys
+
+# Configuration
+# Resolve paths relative to this script file
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)              # site
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+CONFIG_PATH = os.path.join(SRC_DIR, "appwrite", "config.js")
+
+# Appwrite returns 25 documents when no Query.limit is given
+DEFAULT_PAGE_SIZE = 25
+# Collections expected to grow without bound: offset pagination there gets
+# slower with every page, cursorAfter does not.
+LARGE_COLLECTIONS = {
+    'listings', 'agents', 'agent_leads', 'audit_logs', 'activity_logs', 'notifications',
+    'messages', 'transactions', 'favorites', 'sms_logs', 'users_extended', 'bids', 'reviews',
+}
+
+LIST_METHODS = ('listDocuments', 'listRows')
+GET_METHODS = ('getDocument', 'getRow')
+CALL_PATTERN = re.compile(r'\.(%s)\s*\(' % '|'.join(LIST_METHODS + GET_METHODS))
+CONST_PATTERN = re.compile(r'\bconst\s+([A-Z_][A-Z0-9_]*)\s*=\s*[\'"]([^\'"]+)[\'"]')
+ITERATION_CALL = re.compile(r'\.(map|flatMap|forEach|reduce|filter|some|every|find)\s*$')
+LOOP_KEYWORD = re.compile(r'\b(for|while)\s*$')
+DO_KEYWORD = re.compile(r'\bdo\s*$')
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+def mask_source(text):
+    """Blank out comments and string/template/regex contents (keeping offsets and
+    newlines) so brackets can be matched on the result."""
+    out = list(text)
+    i, n = 0, len(text)
+    last_code = ''
+
+    def blank(start, end):
+        for k in range(start, end):
+            if out[k] != '\n':
+                out[k] = ' '
+
+    while i < n:
+        c = text[i]
+        nxt = text[i + 1] if i + 1 < n else ''
+        if c == '/' and nxt == '/':
+            end = text.find('\n', i)
+            end = n if end == -1 else end
+            blank(i, end)
+            i = end
+        elif c == '/' and nxt == '*':
+            end = text.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            blank(i, end)
+            i = end
+        elif c in ('"', "'"):
+            # Quoted strings cannot span lines; an unterminated quote is JSX text
+            # (e.g. "Don't"), so leave that line alone.
+            j = i + 1
+            while j < n and text[j] not in (c, '\n'):
+                j += 2 if text[j] == '\\' else 1
+            if j < n and text[j] == c:
+                blank(i + 1, j)
+                i = j + 1
+                last_code = c
+            else:
+                i += 1
+        elif c == '`':
+            j = i + 1
+            while j < n and text[j] != '`':
+                j += 2 if text[j] == '\\' else 1
+            blank(i + 1, min(j, n))
+            i = j + 1
+            last_code = c
+        elif c == '/' and (last_code in REGEX_PRECEDERS or last_code == ''):
+            j = i + 1
+            while j < n and text[j] not in ('/', '\n'):
+                j += 2 if text[j] == '\\' else 1
+            if j < n and text[j] == '/':
+                blank(i + 1, j)
+                i = j + 1
+                last_code = '/'
+            else:
+                i += 1
+        else:
+            if not c.isspace():
+                last_code = c
+            i += 1
+    return ''.join(out)
+
+def find_close(masked, open_idx):
+    depth = 0
+    for k in range(open_idx, len(masked)):
+        if masked[k] in '([{':
+            depth += 1
+        elif masked[k] in ')]}':
+            depth -= 1
+            if depth == 0:
+                return k
+    return len(masked) - 1
+
+def iteration_contexts(masked, offsets):
+    """For each call offset, return the innermost enclosing iteration as
+    (kind, line) or None. Tracks for/while/do bodies (braced, or a single
+    statement up to its ';') and callbacks passed to .map/.forEach/... in one
+    pass over the masked source."""
+    wanted = sorted(set(offsets))
+    result = {}
+    stack = []              # entries: iteration tag or None
+    statements = []         # brace-less loop bodies: (bracket depth, tag)
+    pending_loop = None     # a for/while header just closed; its body may follow
+    w = 0
+    for i, c in enumerate(masked):
+        while w < len(wanted) and wanted[w] == i:
+            # A brace-less body sits between stack[depth - 1] and stack[depth]
+            tags = [(k, t) for k, t in enumerate(stack) if t] + [(d - 0.5, t) for d, t in statements]
+            result[i] = max(tags, key=lambda item: item[0])[1] if tags else None
+            w += 1
+        if pending_loop and i >= pending_loop[2] and not c.isspace() and c != '{':
+            # `for (...) await get(...);` -- an empty `;` body (do...while) is no body
+            if c != ';':
+                statements.append((len(stack), (f"{pending_loop[0]} loop", pending_loop[1])))
+            pending_loop = None
+        if c in '({[':
+            before = masked[max(0, i - 40):i]
+            line = masked.count('\n', 0, i) + 1
+            tag = None
+            if c == '(':
+                m = ITERATION_CALL.search(before)
+                if m:
+                    tag = (f".{m.group(1)}()", line)
+                elif LOOP_KEYWORD.search(before):
+                    tag = "header:" + LOOP_KEYWORD.search(before).group(1)
+            elif c == '{':
+                if pending_loop and not masked[pending_loop[2]:i].strip():
+                    tag = (f"{pending_loop[0]} loop", pending_loop[1])
+                elif DO_KEYWORD.search(before):
+                    tag = ("do loop", line)
+            stack.append(tag)
+            pending_loop = None
+        elif c in ')}]':
+            tag = stack.pop() if stack else None
+            # The enclosing block closed before the statement's ';' (ASI)
+            statements = [s for s in statements if s[0] <= len(stack)]
+            if isinstance(tag, str) and tag.startswith("header:"):
+                pending_loop = (tag.split(":")[1], masked.count('\n', 0, i) + 1, i + 1)
+        elif c == ';':
+            statements = [s for s in statements if s[0] != len(stack)]
+    # The loop header itself is not an iteration context
+    return {k: (v if not isinstance(v, str) else None) for k, v in result.items()}
+
+def split_args(masked_args, args):
+    parts, depth, start = [], 0, 0
+    for k, c in enumerate(masked_args):
+        if c in '([{':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(args[start:k].strip())
+            start = k + 1
+    if args[start:].strip():
+        parts.append(args[start:].strip())
+    return parts
+
+def load_constants():
+    constants = {}
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            constants.update(CONST_PATTERN.findall(f.read()))
+    return constants
+
+def resolve_collection(arg, constants):
+    if not arg:
+        return None
+    literal = re.fullmatch(r'[\'"]([^\'"]+)[\'"]', arg)
+    if literal:
+        return literal.group(1)
+    return constants.get(arg.split('.')[-1])
+
+def queries_text(call_args, text, call_offset):
+    """The query list passed to the call. If it is a variable, include every
+    earlier statement in the file that builds it (const q = [...]; q.push(...))."""
+    if not call_args:
+        return ""
+    ident = call_args.strip()
+    if not re.fullmatch(r'[A-Za-z_$][\w$]*', ident):
+        return call_args
+    preceding = text[max(0, call_offset - 4000):call_offset]
+    pieces = re.findall(r'\b%s\b\s*(?:=|\.push\s*\()[^;]*' % re.escape(ident), preceding)
+    return ident + " " + " ".join(pieces)
+
+def scan_file(path, constants):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    masked = mask_source(text)
+    local_constants = dict(constants, **dict(CONST_PATTERN.findall(text)))
+
+    calls = []
+    for m in CALL_PATTERN.finditer(masked):
+        open_idx = m.end() - 1
+        close_idx = find_close(masked, open_idx)
+        args = split_args(masked[open_idx + 1:close_idx], text[open_idx + 1:close_idx])
+        # TablesDB style: listRows({ databaseId, tableId, queries })
+        if len(args) == 1 and args[0].startswith('{'):
+            obj = args[0]
+            table = re.search(r'\btableId\s*:\s*([^,}\n]+)', obj)
+            queries = re.search(r'\bqueries\s*:\s*(\[[\s\S]*?\]|[\w$]+)', obj)
+            collection_arg = table.group(1).strip() if table else None
+            query_arg = queries.group(1) if queries else ""
+        else:
+            collection_arg = args[1] if len(args) > 1 else None
+            query_arg = args[2] if len(args) > 2 else ""
+        calls.append({
+            "method": m.group(1),
+            "offset": m.start(),
+            "line": text.count('\n', 0, m.start()) + 1,
+            "collection": resolve_collection(collection_arg, local_constants) or collection_arg or "?",
+            "queries": queries_text(query_arg, text, m.start()),
+        })
+
+    contexts = iteration_contexts(masked, [c["offset"] for c in calls])
+    for call in calls:
+        call["iteration"] = contexts.get(call["offset"])
+    return calls
+
+def page_size(queries):
+    limit = re.search(r'Query\.limit\s*\(\s*(\d+)\s*\)', queries)
+    return int(limit.group(1)) if limit else DEFAULT_PAGE_SIZE
+
+def analyze(calls, rel_path):
+    """Returns (findings, estimated requests per render) for one file."""
+    findings = []
+    requests = 0
+    last_page_size = DEFAULT_PAGE_SIZE
+    for call in calls:
+        is_list = call["method"] in LIST_METHODS
+        where = f"{rel_path}:{call['line']}"
+        paginated = is_list and ('Query.cursorAfter' in call["queries"] or 'Query.offset' in call["queries"])
+        if call["iteration"] and paginated:
+            # Walking one collection page by page: a request per page, not per item
+            requests += 1
+        elif call["iteration"]:
+            kind, loop_line = call["iteration"]
+            # The loop most likely walks the page returned by the previous list call
+            requests += last_page_size
+            findings.append(("n+1", f"❌ {where} -> {call['method']}('{call['collection']}') inside {kind} "
+                                    f"(line {loop_line}): ~{last_page_size} requests per render"))
+        else:
+            requests += 1
+        if not is_list:
+            continue
+        if 'Query.limit' not in call["queries"]:
+            findings.append(("unbounded", f"⚠️  {where} -> {call['method']}('{call['collection']}') has no Query.limit "
+                                          f"(silently capped at {DEFAULT_PAGE_SIZE})"))
+        if 'Query.offset' in call["queries"] and call["collection"] in LARGE_COLLECTIONS:
+            findings.append(("offset", f"⚠️  {where} -> offset pagination on large collection "
+                                       f"'{call['collection']}'; use Query.cursorAfter"))
+        last_page_size = page_size(call["queries"])
+    return findings, requests
+
+def scan_query_patterns():
+    constants = load_constants()
+    report = []
+    for root, dirs, files in os.walk(SRC_DIR):
+        for file in sorted(files):
+            if not file.endswith(('.js', '.jsx', '.ts', '.tsx')):
+                continue
+            path = os.path.join(root, file)
+            rel_path = os.path.relpath(path, PROJECT_ROOT)
+            try:
+                calls = scan_file(path, constants)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if calls:
+                findings, requests = analyze(calls, rel_path)
+                report.append((rel_path, findings, requests))
+    return report
+
+if __name__ == "__main__":
+    # --strict also fails on unbounded list calls and offset pagination
+    strict = "--strict" in sys.argv
+    print("🔍 Scanning Appwrite list/get call sites...")
+    report = scan_query_patterns()
+
+    counts = {"n+1": 0, "unbounded": 0, "offset": 0}
+    for rel_path, findings, requests in sorted(report, key=lambda r: -r[2]):
+        if not findings:
+            continue
+        print(f"\n📄 {rel_path} (~{requests} requests per render)")
+        for kind, message in findings:
+            counts[kind] += 1
+            print(f"   {message}")
+
+    print(f"\nℹ️  {sum(len(r[1]) for r in report)} findings in {len(report)} files: "
+          f"{counts['n+1']} N+1, {counts['unbounded']} unbounded, {counts['offset']} offset pagination.")
+    failing = counts["n+1"] + (counts["unbounded"] + counts["offset"] if strict else 0)
+    if failing:
+        print(f"\n🚨 Found {failing} query patterns that must be fixed.")
+        exit(1)
+    print("\n✅ No N+1 query patterns found.")
+    exit(0)
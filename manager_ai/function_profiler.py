@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+import statistics
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)              # site
+FUNCTIONS_DIR = os.path.join(PROJECT_ROOT, "functions")
+BASELINE_FILE = os.path.join(BASE_DIR, "function_baseline.json")
+# Sandboxes live outside the project so their node_modules never reach tsconfig/eslint
+SANDBOX_DIR = os.getenv(
+    "FUNCTION_SANDBOX_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "manager_ai", "function_sandboxes")
+)
+
+RUNS = 3                     # cold starts per function; the median is reported
+INVOKE_TIMEOUT_MS = 10000
+SIZE_GROWTH_PCT = float(os.getenv("FN_SIZE_GROWTH_PCT", "10"))
+COLD_START_FACTOR = float(os.getenv("FN_COLD_START_FACTOR", "1.5"))
+COLD_START_MIN_MS = 50       # ignore jitter below this
+
+# Appwrite env for the mock run. The endpoint refuses connections, so any SDK
+# call fails fast instead of hanging on the network. The harness gets only this
+# plus what node needs to start: never the bot's own tokens.
+PASSTHROUGH_ENV = ("PATH", "HOME", "SYSTEMROOT", "TEMP", "TMP")
+MOCK_ENV = {
+    "APPWRITE_ENDPOINT": "http://127.0.0.1:9/v1",
+    "APPWRITE_FUNCTION_API_ENDPOINT": "http://127.0.0.1:9/v1",
+    "APPWRITE_PROJECT_ID": "profile",
+    "APPWRITE_FUNCTION_PROJECT_ID": "profile",
+    "APPWRITE_API_KEY": "profile",
+}
+
+# Loads the handler and invokes it once with a mock Appwrite context.
+# performance.now() counts from process start, so the numbers include Node boot.
+HARNESS = """
+import { pathToFileURL } from 'url';
+const bootMs = performance.now();
+const mod = await import(pathToFileURL(process.argv[2]).href);
+const importedMs = performance.now();
+const reply = (body, status = 200) => ({ body, status });
+const ctx = {
+    req: { method: 'POST', path: '/', headers: {}, query: {}, body: '{}', bodyRaw: '{}', bodyText: '{}', bodyJson: {} },
+    res: { json: reply, send: reply, text: reply, empty: () => reply(''), redirect: (url, status = 301) => reply(url, status) },
+    log: () => {},
+    error: () => {},
+};
+let error = null;
+try {
+    await Promise.race([
+        mod.default(ctx),
+        new Promise((_, reject) => setTimeout(() => reject(new Error('handler timed out')), %d)),
+    ]);
+} catch (e) {
+    error = e.message;
+}
+const invokedMs = performance.now();
+console.log(JSON.stringify({ boot_ms: bootMs, import_ms: importedMs - bootMs, invoke_ms: invokedMs - importedMs, first_invocation_ms: invokedMs, error }));
+process.exit(0);
+""" % INVOKE_TIMEOUT_MS
+
+def _dependency_key(func_path):
+    """Sandboxes are reused until package.json or the lockfile changes."""
+    digest = hashlib.sha256()
+    for name in ("package.json", "package-lock.json"):
+        path = os.path.join(func_path, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def prepare_sandbox(func_name):
+    """Install the function's production dependencies into a cached sandbox and
+    copy in the current sources. Returns the sandbox path."""
+    func_path = os.path.join(FUNCTIONS_DIR, func_name)
+    sandbox = os.path.join(SANDBOX_DIR, f"{func_name}-{_dependency_key(func_path)}")
+    marker = os.path.join(sandbox, ".installed")
+
+    if not os.path.exists(marker):
+        shutil.rmtree(sandbox, ignore_errors=True)
+        os.makedirs(sandbox)
+        for name in ("package.json", "package-lock.json"):
+            if os.path.exists(os.path.join(func_path, name)):
+                shutil.copy2(os.path.join(func_path, name), sandbox)
+        has_lock = os.path.exists(os.path.join(sandbox, "package-lock.json"))
+        cmd = "npm ci --omit=dev --no-audit --no-fund" if has_lock else "npm install --omit=dev --no-audit --no-fund"
+        print(f"   📦 Installing dependencies ({cmd.split()[1]})...")
+        result = subprocess.run(cmd, cwd=sandbox, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"Dependency install failed:\n   {result.stderr.decode('utf-8').strip()[-500:]}")
+        open(marker, 'w').close()
+
+    # Sources change far more often than dependencies: always refresh them
+    for entry in os.listdir(func_path):
+        if entry in ("node_modules", "package.json", "package-lock.json"):
+            continue
+        src = os.path.join(func_path, entry)
+        dst = os.path.join(sandbox, entry)
+        if os.path.isdir(src):
+            shutil.rmtree(dst, ignore_errors=True)
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+    return sandbox
+
+def dependency_footprint(sandbox):
+    """(bytes on disk, installed package count) of the sandbox's node_modules."""
+    total_bytes = 0
+    packages = 0
+    node_modules = os.path.join(sandbox, "node_modules")
+    for root, dirs, files in os.walk(node_modules):
+        for name in files:
+            try:
+                total_bytes += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+        # A package is a directory directly under node_modules (or a @scope) with a package.json
+        parent = os.path.basename(os.path.dirname(root))
+        if "package.json" in files and (parent == "node_modules" or parent.startswith("@")):
+            packages += 1
+    return total_bytes, packages
+
+def measure_cold_start(sandbox, main_file):
+    harness_path = os.path.join(sandbox, ".profile_harness.mjs")
+    with open(harness_path, 'w', encoding='utf-8') as f:
+        f.write(HARNESS)
+
+    samples = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            ["node", harness_path, os.path.join(sandbox, main_file)],
+            cwd=sandbox,
+            env=dict({k: os.environ[k] for k in PASSTHROUGH_ENV if k in os.environ}, **MOCK_ENV),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=INVOKE_TIMEOUT_MS / 1000 + 30
+        )
+        lines = result.stdout.decode('utf-8').strip().splitlines()
+        if result.returncode != 0 or not lines:
+            raise RuntimeError(f"Harness failed:\n   {result.stderr.decode('utf-8').strip()[-500:]}")
+        samples.append(json.loads(lines[-1]))
+
+    return {
+        key: round(statistics.median(s[key] for s in samples), 1)
+        for key in ("boot_ms", "import_ms", "invoke_ms", "first_invocation_ms")
+    }
+
+def profile_function(func_name):
+    func_path = os.path.join(FUNCTIONS_DIR, func_name)
+    with open(os.path.join(func_path, "package.json"), 'r') as f:
+        main_file = json.load(f).get("main", "src/main.js")
+
+    sandbox = prepare_sandbox(func_name)
+    dep_bytes, packages = dependency_footprint(sandbox)
+    timings = measure_cold_start(sandbox, main_file)
+    return {"dep_bytes": dep_bytes, "packages": packages, **timings}
+
+def find_regressions(func_name, current, baseline):
+    issues = []
+    if not baseline:
+        return issues
+    if baseline["dep_bytes"] and (current["dep_bytes"] - baseline["dep_bytes"]) / baseline["dep_bytes"] * 100 > SIZE_GROWTH_PCT:
+        issues.append(
+            f"❌ {func_name}: node_modules grew {baseline['dep_bytes'] // 1024} → {current['dep_bytes'] // 1024} kB "
+            f"({baseline['packages']} → {current['packages']} packages)"
+        )
+    before, after = baseline["first_invocation_ms"], current["first_invocation_ms"]
+    if after > before * COLD_START_FACTOR and after - before > COLD_START_MIN_MS:
+        issues.append(f"❌ {func_name}: cold start regressed {before} → {after} ms (import {current['import_ms']} ms)")
+    return issues
+
+def load_baseline():
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def profile_functions(update_baseline=False):
+    if not os.path.exists(FUNCTIONS_DIR):
+        print(f"❌ Functions directory not found: {FUNCTIONS_DIR}")
+        return 1
+
+    baseline = load_baseline()
+    results = {}
+    errors = []
+
+    for func_name in sorted(os.listdir(FUNCTIONS_DIR)):
+        func_path = os.path.join(FUNCTIONS_DIR, func_name)
+        if not os.path.isdir(func_path) or not os.path.exists(os.path.join(func_path, "package.json")):
+            continue
+
+        print(f"⏱️  Profiling {func_name}...")
+        try:
+            current = profile_function(func_name)
+        except Exception as e:
+            errors.append(f"❌ {func_name}: Profiling Failed - {str(e)}")
+            continue
+
+        results[func_name] = current
+        print(f"   {current['dep_bytes'] / (1024 * 1024):.1f} MB, {current['packages']} packages | "
+              f"first invocation {current['first_invocation_ms']} ms (import {current['import_ms']} ms)")
+        errors.extend(find_regressions(func_name, current, baseline.get(func_name)))
+
+    # Functions without a baseline (first run, or added since) get one recorded;
+    # --update-baseline re-records all of them
+    recorded = results if update_baseline else {k: v for k, v in results.items() if k not in baseline}
+    if recorded:
+        baseline.update(recorded)
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n📌 Baseline recorded for {len(recorded)} functions: {', '.join(sorted(recorded))}.")
+
+    if errors:
+        print("\n🚨 Function Cold-Start Check Failed:")
+        for e in errors:
+            print(e)
+        return 1
+
+    print("\n✅ No cold-start regressions.")
+    return 0
+
+if __name__ == "__main__":
+    update_baseline = "--update-baseline" in sys.argv
+    exit(profile_functions(update_baseline))
@@ -0,0 +1,120 @@
+import requests
+
+# GitHub GraphQL endpoint. One paginated query replaces the per-PR REST calls
+# (pr.draft, get_issue_comments, merge state) that process_pr used to make.
+GRAPHQL_URL = "https://api.github.com/graphql"
+PAGE_SIZE = 50
+MAX_FILES = 100
+LAST_COMMENTS = 5
+
+OPEN_PRS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String, $pageSize: Int!, $maxFiles: Int!, $lastComments: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: $pageSize, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        number
+        title
+        url
+        isDraft
+        headRefOid
+        mergeable
+        mergeStateStatus
+        files(first: $maxFiles) { nodes { path additions deletions } }
+        comments(last: $lastComments) { nodes { body author { login } } }
+      }
+    }
+  }
+}
+"""
+
+MARK_READY_MUTATION = """
+mutation($id: ID!) {
+  markPullRequestReadyForReview(input: {pullRequestId: $id}) { pullRequest { isDraft } }
+}
+"""
+
+MERGE_MUTATION = """
+mutation($id: ID!, $headline: String!, $expectedHeadOid: GitObjectID!) {
+  mergePullRequest(input: {pullRequestId: $id, mergeMethod: SQUASH, commitHeadline: $headline, expectedHeadOid: $expectedHeadOid}) {
+    pullRequest { merged }
+  }
+}
+"""
+
+ADD_COMMENT_MUTATION = """
+mutation($id: ID!, $body: String!) {
+  addComment(input: {subjectId: $id, body: $body}) { clientMutationId }
+}
+"""
+
+class GraphQLError(Exception):
+    pass
+
+def run_graphql(token, query, variables):
+    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
+    response = requests.post(GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers, timeout=30)
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("errors"):
+        raise GraphQLError("; ".join(err.get("message", str(err)) for err in payload["errors"]))
+    return payload["data"]
+
+def _to_record(node):
+    """Flatten a PullRequest node into the compact record process_pr consumes."""
+    return {
+        "id": node["id"],
+        "number": node["number"],
+        "title": node["title"],
+        "url": node["url"],
+        "diff_url": f"{node['url']}.diff",
+        "draft": node["isDraft"],
+        "head_sha": node["headRefOid"],
+        "mergeable": node["mergeable"],           # MERGEABLE / CONFLICTING / UNKNOWN
+        "merge_state": node["mergeStateStatus"],  # CLEAN / BLOCKED / DIRTY / ...
+        "files": [f["path"] for f in (node.get("files") or {}).get("nodes", [])],
+        "comments": [
+            {"author": (c.get("author") or {}).get("login"), "body": c["body"]}
+            for c in (node.get("comments") or {}).get("nodes", [])
+        ],
+    }
+
+def fetch_open_prs(token, repo_name):
+    """Fetch every open PR of owner/name with one query per page of PAGE_SIZE PRs."""
+    owner, name = repo_name.split("/", 1)
+    records = []
+    cursor = None
+    while True:
+        data = run_graphql(token, OPEN_PRS_QUERY, {
+            "owner": owner,
+            "name": name,
+            "cursor": cursor,
+            "pageSize": PAGE_SIZE,
+            "maxFiles": MAX_FILES,
+            "lastComments": LAST_COMMENTS,
+        })
+        pulls = data["repository"]["pullRequests"]
+        records.extend(_to_record(node) for node in pulls["nodes"])
+        if not pulls["pageInfo"]["hasNextPage"]:
+            return records
+        cursor = pulls["pageInfo"]["endCursor"]
+
+def mark_ready_for_review(token, pr_id):
+    run_graphql(token, MARK_READY_MUTATION, {"id": pr_id})
+
+def merge_pull_request(token, pr_id, headline, expected_head_sha):
+    """Squash-merge, refusing if the head moved since it was reviewed."""
+    data = run_graphql(token, MERGE_MUTATION, {"id": pr_id, "headline": headline, "expectedHeadOid": expected_head_sha})
+    return data["mergePullRequest"]["pullRequest"]["merged"]
+
+def add_comment(token, subject_id, body):
+    run_graphql(token, ADD_COMMENT_MUTATION, {"id": subject_id, "body": body})
+
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    for pr in fetch_open_prs(os.getenv("GITHUB_TOKEN"), os.getenv("REPO_NAME")):
+        print(f"PR #{pr['number']}: {pr['title']} | draft={pr['draft']} | {pr['mergeable']} | {len(pr['files'])} files | {pr['head_sha'][:7]}")
@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+import socket
+import sqlite3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # site/manager_ai
+DEFAULT_URL = f"sqlite:///{os.path.join(BASE_DIR, 'leases.db')}"
+
+# Several bots (processes or hosts) share one store. A lease is renewed every
+# TTL/3 while its work runs, so a crashed worker's lease lapses after at most
+# TTL seconds and the next worker to ask takes it over.
+LEASE_URL = os.getenv("LEASE_BACKEND", DEFAULT_URL)
+LEASE_TTL = int(os.getenv("LEASE_TTL", "120"))
+WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+class SqliteLeaseStore:
+    """Leases in a SQLite table. Fine for several processes on one host, or on a
+    shared volume with working file locks. Every operation is one statement, so
+    acquire/take-over is atomic without an explicit transaction."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leases (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(self.SCHEMA)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self.db.execute(sql, params)
+
+    def acquire(self, key, owner, ttl):
+        """Take the lease if it is free, expired, or already ours. Returns True on success."""
+        now = time.time()
+        cursor = self._execute(
+            """
+            INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE leases.expires_at < ? OR leases.owner = excluded.owner
+            """,
+            (key, owner, now + ttl, now)
+        )
+        return cursor.rowcount == 1
+
+    def renew(self, key, owner, ttl):
+        """Extend a lease we still hold. False means it lapsed and someone else took it."""
+        cursor = self._execute(
+            "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+            (time.time() + ttl, key, owner)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, key, owner):
+        self._execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def holder(self, key):
+        """Current (owner, expires_at) of a live lease, or None."""
+        row = self._execute(
+            "SELECT owner, expires_at FROM leases WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row
+
+    def live_leases(self):
+        return self._execute(
+            "SELECT key, owner, expires_at FROM leases WHERE expires_at >= ? ORDER BY key", (time.time(),)
+        ).fetchall()
+
+    def purge_expired(self):
+        self._execute("DELETE FROM leases WHERE expires_at < ?", (time.time(),))
+
+# Backends by URL scheme. Another store (e.g. Redis or Postgres for workers on
+# different hosts) only needs acquire/renew/release/holder/live_leases/purge_expired
+# with the same semantics, registered here under its scheme.
+BACKENDS = {
+    # sqlite:///relative/path.db or sqlite:////absolute/path.db
+    "sqlite": lambda url: SqliteLeaseStore(url.path[1:]),
+}
+
+def register_backend(scheme, factory):
+    BACKENDS[scheme] = factory
+
+def open_store(url=LEASE_URL):
+    parsed = urlparse(url)
+    if parsed.scheme not in BACKENDS:
+        raise ValueError(f"Unknown lease backend '{parsed.scheme}' (known: {', '.join(sorted(BACKENDS))})")
+    return BACKENDS[parsed.scheme](parsed)
+
+# Store calls get their own thread: on the shared default executor a renewal
+# could queue behind slow GitHub calls until the lease had already lapsed.
+_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leases")
+
+async def store_call(method, *args):
+    """Run a (blocking) store method off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_store_executor, method, *args)
+
+class Lease:
+    """Hold a lease for the duration of an async block, renewing it in the background.
+
+        async with Lease(store, "health:owner/repo") as lease:
+            if lease.acquired:
+                ...
+
+    On exit the lease is released, unless keep(ttl) was called: then it is left to
+    expire after ttl seconds, which stops other workers from repeating work that
+    was just finished.
+    """
+
+    def __init__(self, store, key, ttl=LEASE_TTL, owner=WORKER_ID):
+        self.store = store
+        self.key = key
+        self.ttl = ttl
+        self.owner = owner
+        self.acquired = False
+        self.lost = False
+        self._keep_ttl = None
+        self._heartbeat = None
+
+    async def _renew_loop(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            if not await store_call(self.store.renew, self.key, self.owner, self.ttl):
+                # Someone took over (we stalled for longer than the TTL); the
+                # work in progress should check .lost before committing.
+                self.lost = True
+                return
+
+    def keep(self, ttl):
+        self._keep_ttl = ttl
+
+    async def __aenter__(self):
+        self.acquired = await store_call(self.store.acquire, self.key, self.owner, self.ttl)
+        if self.acquired:
+            self._heartbeat = asyncio.create_task(self._renew_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if not self.acquired:
+            return False
+        self._heartbeat.cancel()
+        if self.lost:
+            return False
+        if self._keep_ttl is not None:
+            await store_call(self.store.renew, self.key, self.owner, self._keep_ttl)
+        else:
+            await store_call(self.store.release, self.key, self.owner)
+        return False
+
+if __name__ == "__main__":
+    # Usage: python leases.py [--purge]
+    store = open_store()
+    if "--purge" in sys.argv:
+        store.purge_expired()
+    leases = store.live_leases()
+    if not leases:
+        print(f"No live leases in {LEASE_URL}.")
+        exit(0)
+    print(f"🔒 {len(leases)} live leases ({LEASE_URL}):")
+    for key, owner, expires_at in leases:
+        print(f"   {key:<50} {owner:<30} expires in {int(expires_at - time.time())}s")
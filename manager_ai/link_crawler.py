@@ -0,0 +1,197 @@
+import os
+import re
+import json
+import time
+import asyncio
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import aiohttp
+
+from playwright_shards import BASE_URL, start_server, stop_server
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)                 # site
+# Pages that need a real browser (forms to fuzz) are handed to spider.spec.js here
+SPIDER_SEEDS_FILE = os.path.join(PROJECT_ROOT, "tests", "e2e", "spider_seeds.json")
+
+# Same deep pages spider.spec.js seeds itself with, plus the sitemap
+SEED_PATHS = ['/', '/pricing', '/vault', '/properties/create', '/properties', '/agents']
+CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "32"))
+MAX_URLS = int(os.getenv("CRAWL_MAX_URLS", "5000"))
+REQUEST_TIMEOUT = 15          # seconds
+SLOW_MS = 2000                # server response slower than this is flagged
+MAX_PAGE_BYTES = 1024 * 1024  # HTML payload larger than this is flagged
+MAX_REDIRECTS = 1             # more hops than this is flagged
+IGNORED_STATUSES = {401}      # auth-only pages, same as spider.spec.js
+
+class PageParser(HTMLParser):
+    """Collects hrefs and notes whether the page has anything to interact with."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self.needs_js = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.links.append(href)
+        elif tag in ('form', 'input', 'textarea', 'select'):
+            self.needs_js = True
+
+class LinkCrawler:
+    def __init__(self, base_url=BASE_URL, concurrency=CONCURRENCY, max_urls=MAX_URLS):
+        self.base_url = base_url.rstrip('/')
+        self.origin = urlparse(self.base_url).netloc
+        self.concurrency = concurrency
+        self.max_urls = max_urls
+        self.seen = set()
+        self.queue = asyncio.Queue()
+        self.results = []
+
+    def _normalize(self, href, page_url):
+        url, _ = urldefrag(urljoin(page_url, href))
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc != self.origin:
+            return None
+        if parsed.path.startswith('/_next/'):
+            return None
+        return url
+
+    def _enqueue(self, url):
+        if url and url not in self.seen and len(self.seen) < self.max_urls:
+            self.seen.add(url)
+            self.queue.put_nowait(url)
+
+    async def _seed_from_sitemap(self, session):
+        """Listing and agent pages are mostly reachable via the sitemap."""
+        try:
+            async with session.get(f"{self.base_url}/sitemap.xml") as resp:
+                if resp.status != 200:
+                    return
+                body = await resp.text()
+        except aiohttp.ClientError:
+            return
+        for loc in re.findall(r'<loc>\s*([^<\s]+)\s*</loc>', body):
+            # The sitemap points at production; crawl the same path locally
+            parsed = urlparse(loc)
+            path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+            self._enqueue(self._normalize(path, self.base_url))
+
+    async def _fetch(self, session, url):
+        started = time.perf_counter()
+        result = {"url": url, "path": urlparse(url).path or '/'}
+        try:
+            async with session.get(url, allow_redirects=True) as resp:
+                body = await resp.read()
+                result.update({
+                    "status": resp.status,
+                    "redirects": len(resp.history),
+                    "final_url": str(resp.url),
+                    "bytes": len(body),
+                    "ms": round((time.perf_counter() - started) * 1000),
+                    "needs_js": False,
+                })
+                if 'text/html' in resp.headers.get('Content-Type', '') and urlparse(str(resp.url)).netloc == self.origin:
+                    parser = PageParser()
+                    parser.feed(body.decode(resp.charset or 'utf-8', errors='replace'))
+                    result["needs_js"] = parser.needs_js
+                    for href in parser.links:
+                        self._enqueue(self._normalize(href, str(resp.url)))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result.update({"status": None, "error": str(e) or type(e).__name__,
+                           "ms": round((time.perf_counter() - started) * 1000)})
+        return result
+
+    async def _worker(self, session):
+        while True:
+            url = await self.queue.get()
+            try:
+                self.results.append(await self._fetch(session, url))
+            except Exception as e:
+                # A dead worker would leave queue.join() waiting forever; record
+                # anything _fetch did not anticipate as a failed request instead.
+                self.results.append({"url": url, "path": urlparse(url).path or '/', "status": None,
+                                     "error": f"{type(e).__name__}: {e}", "ms": 0})
+            finally:
+                self.queue.task_done()
+
+    async def crawl(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            for path in SEED_PATHS:
+                self._enqueue(self._normalize(path, self.base_url))
+            await self._seed_from_sitemap(session)
+
+            workers = [asyncio.create_task(self._worker(session)) for _ in range(self.concurrency)]
+            await self.queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.results
+
+def analyze(results):
+    """Split crawl results into (errors, warnings)."""
+    errors, warnings = [], []
+    for r in sorted(results, key=lambda r: r["path"]):
+        if r["status"] is None:
+            errors.append(f"❌ {r['path']} -> request failed: {r['error']}")
+        elif r["status"] >= 400 and r["status"] not in IGNORED_STATUSES:
+            errors.append(f"❌ {r['path']} -> HTTP {r['status']}")
+        else:
+            if r["redirects"] > MAX_REDIRECTS:
+                warnings.append(f"⚠️  {r['path']} -> {r['redirects']} redirects to {r['final_url']}")
+            if r["ms"] > SLOW_MS:
+                warnings.append(f"⚠️  {r['path']} -> slow response ({r['ms']} ms)")
+            if r["bytes"] > MAX_PAGE_BYTES:
+                warnings.append(f"⚠️  {r['path']} -> large payload ({r['bytes'] // 1024} kB)")
+    return errors, warnings
+
+def write_spider_seeds(results):
+    """Hand only the pages that need JS execution to the Playwright spider."""
+    seeds = sorted({r["path"] for r in results if r.get("needs_js") and r["status"] and r["status"] < 400})
+    with open(SPIDER_SEEDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(seeds, f, indent=2)
+    return seeds
+
+def percentile(values, pct):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+if __name__ == "__main__":
+    print(f"🕸️ Starting HTTP link crawl of {BASE_URL} (concurrency {CONCURRENCY})...")
+    try:
+        server = start_server()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        exit(1)
+
+    try:
+        started = time.perf_counter()
+        results = asyncio.run(LinkCrawler().crawl())
+        elapsed = time.perf_counter() - started
+    finally:
+        stop_server(server)
+
+    errors, warnings = analyze(results)
+    seeds = write_spider_seeds(results)
+    timings = [r["ms"] for r in results if r["status"]]
+    print(f"ℹ️  Crawled {len(results)} URLs in {elapsed:.1f}s "
+          f"(p50 {percentile(timings, 50)} ms, p95 {percentile(timings, 95)} ms).")
+    print(f"ℹ️  Handed {len(seeds)} interactive pages to the Playwright spider.")
+
+    for warning in warnings:
+        print(warning)
+    if errors:
+        print(f"\n🚨 Found {len(errors)} broken URLs:")
+        for error in errors:
+            print(error)
+        exit(1)
+    print("\n✅ No broken links found.")
+    exit(0)
@@ -0,0 +1,392 @@
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+import aiohttp
+from aiohttp import web
+
+from function_profiler import prepare_sandbox, PASSTHROUGH_ENV
+
+# Runs an Appwrite function handler under concurrent load against an in-memory
+# stand-in for the Databases REST API, then checks scenario invariants.
+
+# Serves the default export over HTTP so one Node process handles many
+# concurrent executions, like a warm Appwrite function container.
+INVOKE_SERVER = """
+import http from 'http';
+import { pathToFileURL } from 'url';
+const mod = await import(pathToFileURL(process.argv[2]).href);
+const parse = (text) => { try { return JSON.parse(text); } catch (e) { return {}; } };
+const server = http.createServer(async (request, response) => {
+    let raw = '';
+    for await (const chunk of request) raw += chunk;
+    const { method, body, headers } = JSON.parse(raw);
+    let result = { body: '', status: 200 };
+    const reply = (payload, status = 200) => (result = { body: payload, status });
+    const ctx = {
+        req: { method, path: '/', headers: headers || {}, query: {}, body, bodyRaw: body, bodyText: body, bodyJson: parse(body) },
+        res: { json: reply, send: reply, text: reply, empty: () => reply(''), redirect: (url, status = 301) => reply(url, status) },
+        log: () => {},
+        error: () => {},
+    };
+    try {
+        await mod.default(ctx);
+    } catch (e) {
+        result = { body: { error: e.message }, status: 500 };
+    }
+    response.writeHead(200, { 'Content-Type': 'application/json' });
+    response.end(JSON.stringify(result));
+});
+server.listen(0, '127.0.0.1', () => console.log(server.address().port));
+"""
+
+# --- In-memory Appwrite Databases stand-in --------------------------------
+
+def _parse_query(raw):
+    """Parse a query in either SDK format:
+    JSON (node-appwrite >= 12): {"method": "equal", "attribute": "a", "values": [1]}
+    Legacy (node-appwrite 11):  equal("a", [1])
+    Returns (method, attribute, values)."""
+    if raw.startswith("{"):
+        query = json.loads(raw)
+        return query["method"], query.get("attribute"), query.get("values") or []
+    method, inner = raw.split("(", 1)
+    args = json.loads(f"[{inner.rstrip(')')}]")
+    if method in ("limit", "offset", "cursorAfter", "cursorBefore"):
+        return method, None, args
+    values = args[1] if len(args) > 1 else []
+    return method, args[0] if args else None, values if isinstance(values, list) else [values]
+
+class MemoryDatabases:
+    """Just enough of /v1/databases/... for the functions under test.
+
+    Each request sleeps latency_ms/2 (+/- jitter) before and after it touches
+    the store, so reads and writes from concurrent executions interleave the way
+    they do against a remote Appwrite instance.
+    """
+
+    def __init__(self, latency_ms=20, jitter_ms=10):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.collections = {}
+        self.sequence = 0
+
+    def seed(self, collection, doc_id, data):
+        return self._write(collection, doc_id, data)
+
+    def documents(self, collection):
+        return sorted(self.collections.get(collection, {}).values(), key=lambda d: d["$sequence"])
+
+    def _write(self, collection, doc_id, data):
+        self.sequence += 1
+        now = datetime.now(timezone.utc).isoformat()
+        doc = {**data, "$id": doc_id, "$collectionId": collection, "$sequence": self.sequence,
+               "$createdAt": now, "$updatedAt": now, "$permissions": []}
+        self.collections.setdefault(collection, {})[doc_id] = doc
+        return doc
+
+    async def _delay(self):
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(0.0, self.latency_ms / 2 + jitter) / 1000)
+
+    def _not_found(self, doc_id):
+        return web.json_response(
+            {"message": f"Document with the requested ID '{doc_id}' could not be found.", "code": 404, "type": "document_not_found"},
+            status=404
+        )
+
+    def _select(self, collection, queries):
+        docs = self.documents(collection)
+        order, limit, offset = None, 25, 0
+        for raw in queries:
+            method, attr, values = _parse_query(raw)
+            if method == "equal":
+                docs = [d for d in docs if d.get(attr) in values]
+            elif method == "notEqual":
+                docs = [d for d in docs if d.get(attr) not in values]
+            elif method in ("greaterThan", "greaterThanEqual", "lessThan", "lessThanEqual"):
+                compare = {
+                    "greaterThan": lambda a, b: a > b, "greaterThanEqual": lambda a, b: a >= b,
+                    "lessThan": lambda a, b: a < b, "lessThanEqual": lambda a, b: a <= b,
+                }[method]
+                docs = [d for d in docs if d.get(attr) is not None and compare(d[attr], values[0])]
+            elif method == "search":
+                docs = [d for d in docs if str(values[0]) in str(d.get(attr, ""))]
+            elif method in ("orderAsc", "orderDesc"):
+                order = (attr, method == "orderDesc")
+            elif method == "limit":
+                limit = values[0]
+            elif method == "offset":
+                offset = values[0]
+        if order:
+            docs = sorted(docs, key=lambda d: (d.get(order[0]) is None, d.get(order[0])), reverse=order[1])
+        return len(docs), docs[offset:offset + limit]
+
+    async def list_documents(self, request):
+        await self._delay()
+        queries = [v for k, v in request.query.items() if k.startswith("queries")]
+        total, docs = self._select(request.match_info["collection"], queries)
+        await self._delay()
+        return web.json_response({"total": total, "documents": docs})
+
+    async def get_document(self, request):
+        await self._delay()
+        collection, doc_id = request.match_info["collection"], request.match_info["document"]
+        doc = self.collections.get(collection, {}).get(doc_id)
+        await self._delay()
+        return web.json_response(doc) if doc else self._not_found(doc_id)
+
+    async def create_document(self, request):
+        payload = await request.json()
+        await self._delay()
+        doc_id = payload.get("documentId", "unique()")
+        if doc_id == "unique()":
+            doc_id = uuid.uuid4().hex[:20]
+        doc = self._write(request.match_info["collection"], doc_id, payload.get("data", {}))
+        await self._delay()
+        return web.json_response(doc, status=201)
+
+    async def update_document(self, request):
+        payload = await request.json()
+        await self._delay()
+        collection, doc_id = request.match_info["collection"], request.match_info["document"]
+        doc = self.collections.get(collection, {}).get(doc_id)
+        if doc:
+            doc.update(payload.get("data", {}))
+            doc["$updatedAt"] = datetime.now(timezone.utc).isoformat()
+        await self._delay()
+        return web.json_response(doc) if doc else self._not_found(doc_id)
+
+    def app(self):
+        app = web.Application()
+        base = "/v1/databases/{database}/collections/{collection}/documents"
+        app.router.add_get(base, self.list_documents)
+        app.router.add_post(base, self.create_document)
+        app.router.add_get(base + "/{document}", self.get_document)
+        app.router.add_patch(base + "/{document}", self.update_document)
+        return app
+
+# --- Scenarios --------------------------------------------------------------
+# Each scenario seeds the store, builds one request body per execution and
+# checks an invariant afterwards. Add new functions by registering here.
+
+def _setup_auction(store, options):
+    for i in range(options.keys):
+        store.seed("listings", f"property-{i}", {"title": f"Auction {i}", "price": 1000000})
+
+def _bid_payload(i, options):
+    return {
+        "property_id": f"property-{i % options.keys}",
+        "user_id": f"user-{i % 50}",
+        "amount": 1000000 + random.randint(1, options.requests * 100),
+    }
+
+def _check_bids(store, options):
+    """Accepted bids must be strictly increasing per property, in commit order."""
+    violations = []
+    highest = {}
+    for bid in store.documents("bids"):
+        previous = highest.get(bid["property_id"])
+        if previous is not None and bid["amount"] <= previous:
+            violations.append(f"{bid['property_id']}: bid {bid['amount']} accepted after {previous}")
+        highest[bid["property_id"]] = max(bid["amount"], previous or 0)
+    return violations
+
+def _otp_for(listing_id):
+    return str(100000 + int(listing_id.split("-")[1]))
+
+def _setup_otp(store, options):
+    for i in range(options.keys):
+        listing_id = f"listing-{i}"
+        store.seed("listings", listing_id, {
+            "status": "pending_owner",
+            "owner_phone": "+94770000000",
+            "verification_code": hashlib.sha256(_otp_for(listing_id).encode()).hexdigest(),
+        })
+
+def _otp_payload(i, options):
+    listing_id = f"listing-{i % options.keys}"
+    return {"listing_id": listing_id, "otp": _otp_for(listing_id)}
+
+def _check_otp(store, options):
+    """An OTP is single use: at most one consent log per listing."""
+    counts = {}
+    for log_doc in store.documents("consent_logs"):
+        counts[log_doc["listing_id"]] = counts.get(log_doc["listing_id"], 0) + 1
+    return [f"{listing}: OTP consumed {n} times" for listing, n in sorted(counts.items()) if n > 1]
+
+PAYHERE_MERCHANT_ID = "1200000"
+PAYHERE_SECRET = "load-test-secret"
+
+def _payment_payload(i, options):
+    """PayHere retries notifications, so every payment is delivered `options.duplicates` times."""
+    payment = i // options.duplicates
+    fields = {
+        "merchant_id": PAYHERE_MERCHANT_ID,
+        "order_id": f"ORDER_{payment}",
+        "payment_id": f"32000{payment:06d}",
+        "payhere_amount": "1000.00",
+        "payhere_currency": "LKR",
+        "status_code": "2",
+        "custom_1": f"user-{payment % options.keys}",
+        "custom_2": "wallet_deposit",
+    }
+    secret_hash = hashlib.md5(PAYHERE_SECRET.encode()).hexdigest().upper()
+    sign = f"{fields['merchant_id']}{fields['order_id']}{fields['payhere_amount']}{fields['payhere_currency']}{fields['status_code']}{secret_hash}"
+    fields["md5sig"] = hashlib.md5(sign.encode()).hexdigest().upper()
+    return fields
+
+def _check_payments(store, options):
+    """Each payment is recorded once and credited to the wallet once."""
+    violations = []
+    seen = {}
+    for tx in store.documents("transactions"):
+        payment_id = tx["description"].split("PayHere ID: ")[1].split(" |")[0]
+        seen[payment_id] = seen.get(payment_id, 0) + 1
+    violations += [f"payment {p}: recorded {n} times" for p, n in sorted(seen.items()) if n > 1]
+
+    expected = {}
+    for payment in range(-(-options.requests // options.duplicates)):
+        user = f"user-{payment % options.keys}"
+        expected[user] = expected.get(user, 0) + 1000.0
+    wallets = {}
+    for wallet in store.documents("user_wallets"):
+        wallets.setdefault(wallet["user_id"], []).append(wallet["balance"])
+    violations += [f"{user}: paid but no wallet" for user in sorted(expected) if user not in wallets]
+    for user, balances in sorted(wallets.items()):
+        if len(balances) > 1:
+            violations.append(f"{user}: {len(balances)} wallets created")
+        if sum(balances) != expected.get(user):
+            violations.append(f"{user}: wallet balance {sum(balances)} != {expected.get(user)} paid")
+    return violations
+
+SCENARIOS = {
+    "place-bid": {"setup": _setup_auction, "payload": _bid_payload, "check": _check_bids, "env": {}},
+    "verify-otp": {"setup": _setup_otp, "payload": _otp_payload, "check": _check_otp, "env": {}},
+    "process-payment": {
+        "setup": lambda store, options: None,
+        "payload": _payment_payload,
+        "check": _check_payments,
+        "env": {"PAYHERE_MERCHANT_ID": PAYHERE_MERCHANT_ID, "PAYHERE_MERCHANT_SECRET": PAYHERE_SECRET},
+    },
+}
+
+# --- Runner -----------------------------------------------------------------
+
+async def _start_workers(sandbox, main_file, count, env):
+    harness = os.path.join(sandbox, ".load_test_server.mjs")
+    with open(harness, 'w', encoding='utf-8') as f:
+        f.write(INVOKE_SERVER)
+
+    workers = []
+    for _ in range(count):
+        process = await asyncio.create_subprocess_exec(
+            "node", harness, os.path.join(sandbox, main_file),
+            cwd=sandbox, env=env,
+            stdout=asyncio.subprocess.PIPE
+        )
+        line = await asyncio.wait_for(process.stdout.readline(), timeout=30)
+        if not line:
+            raise RuntimeError("Function worker exited before listening.")
+        workers.append((process, f"http://127.0.0.1:{int(line)}/"))
+    return workers
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0
+
+async def run_load_test(options, sandbox=None):
+    scenario = SCENARIOS[options.scenario]
+    store = MemoryDatabases(options.latency_ms, options.jitter_ms)
+    scenario["setup"](store, options)
+
+    runner = web.AppRunner(store.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    sandbox = sandbox or prepare_sandbox(options.scenario)
+    with open(os.path.join(sandbox, "package.json"), 'r') as f:
+        main_file = json.load(f).get("main", "src/main.js")
+    # Only the mock endpoint and scenario settings: the bot's real keys stay out of the sandbox
+    env = dict({k: os.environ[k] for k in PASSTHROUGH_ENV if k in os.environ},
+               APPWRITE_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+               APPWRITE_PROJECT_ID="load-test",
+               APPWRITE_FUNCTION_PROJECT_ID="load-test",
+               APPWRITE_API_KEY="load-test",
+               **scenario["env"])
+    workers = await _start_workers(sandbox, main_file, options.workers, env)
+
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(options.concurrency)
+    try:
+        connector = aiohttp.TCPConnector(limit=options.concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def invoke(i):
+                body = json.dumps(scenario["payload"](i, options))
+                url = workers[i % len(workers)][1]
+                async with semaphore:
+                    started = time.perf_counter()
+                    async with session.post(url, json={"method": "POST", "body": body, "headers": {}}) as resp:
+                        result = await resp.json()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*[invoke(i) for i in range(options.requests)])
+            elapsed = time.perf_counter() - started
+    finally:
+        for process, _ in workers:
+            process.terminate()
+            await process.wait()
+        await runner.cleanup()
+
+    return {
+        "requests": options.requests,
+        "elapsed_s": elapsed,
+        "throughput": options.requests / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "statuses": statuses,
+        "violations": scenario["check"](store, options),
+    }
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Concurrency load test for Appwrite functions.")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20, help="mean Databases round trip")
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="Node processes (function containers)")
+    parser.add_argument("--keys", type=int, default=1, help="properties / listings / users under contention")
+    parser.add_argument("--duplicates", type=int, default=3, help="process-payment: deliveries per payment")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    options = parse_args(sys.argv[1:])
+    print(f"🔨 Load testing {options.scenario}: {options.requests} executions, concurrency {options.concurrency}, "
+          f"DB latency {options.latency_ms:g}±{options.jitter_ms:g} ms...")
+    report = asyncio.run(run_load_test(options))
+
+    print(f"   Throughput: {report['throughput']:.0f} exec/s ({report['elapsed_s']:.2f}s total)")
+    print(f"   Latency: p50 {report['p50_ms']:.1f} ms | p95 {report['p95_ms']:.1f} ms | p99 {report['p99_ms']:.1f} ms")
+    print(f"   Responses: " + ", ".join(f"{status}: {n}" for status, n in sorted(report["statuses"].items())))
+
+    if report["violations"]:
+        print(f"\n🚨 {len(report['violations'])} Invariant Violations:")
+        for violation in report["violations"][:20]:
+            print(f"❌ {violation}")
+        exit(1)
+    print("\n✅ No invariant violations.")
+    exit(0)
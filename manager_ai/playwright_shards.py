@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import asyncio
+import tempfile
+import subprocess
+import urllib.parse
+import urllib.request
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)                 # site
+HISTORY_FILE = os.path.join(BASE_DIR, "e2e_history.json")
+
+BASE_URL = os.getenv("PLAYWRIGHT_BASE_URL", "http://localhost:3000")
+SERVER_TIMEOUT = 120   # seconds, same as webServer.timeout in playwright.config.mjs
+MAX_SHARDS = 8
+HISTORY_RUNS = 20      # durations kept per spec
+
+def plan_shards(requested=None, tests=None):
+    """Number of parallel Playwright shards, sized to the available cores and
+    never more than the number of tests (extra shards would only boot browsers
+    to run nothing)."""
+    if requested:
+        shards = requested
+    elif os.getenv("E2E_SHARDS"):
+        shards = int(os.getenv("E2E_SHARDS"))
+    else:
+        shards = min(os.cpu_count() or 1, MAX_SHARDS)
+    if tests is not None:
+        shards = min(shards, tests)
+    return max(1, shards)
+
+def count_tests(specs=None):
+    """Number of tests `npx playwright test --list` finds for the specs, or None
+    if listing fails (the shard count is then left uncapped)."""
+    result = subprocess.run(
+        f"npx playwright test {' '.join(specs or [])} --list --reporter=json",
+        shell=True,
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    try:
+        report = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return None
+    return sum(
+        len(spec.get("tests", []))
+        for suite in report.get("suites", [])
+        for _, spec in _walk_specs(suite)
+    )
+
+# --- Shared `next start` server -------------------------------------------
+
+def server_is_up(url=BASE_URL):
+    try:
+        with urllib.request.urlopen(url, timeout=2):
+            return True
+    except urllib.error.HTTPError:
+        return True  # Any HTTP answer means the server is listening
+    except Exception:
+        return False
+
+def start_server(url=BASE_URL):
+    """Start one `next start` for all shards. Returns the process, or None if a
+    server is already listening (playwright.config.mjs then reuses it too)."""
+    if server_is_up(url):
+        return None
+
+    port = urllib.parse.urlparse(url).port or 3000
+    process = subprocess.Popen(
+        f"npm run start -- -p {port}",
+        shell=True,
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Own process group so stop_server can take down npm and next together
+        start_new_session=(os.name != "nt")
+    )
+    deadline = time.time() + SERVER_TIMEOUT
+    while time.time() < deadline:
+        if server_is_up(url):
+            return process
+        if process.poll() is not None:
+            raise RuntimeError("`next start` exited early. Has `npm run build` been run?")
+        time.sleep(1)
+    stop_server(process)
+    raise RuntimeError(f"Server did not come up on {url} within {SERVER_TIMEOUT}s")
+
+def stop_server(process):
+    if process is None or process.poll() is not None:
+        return
+    if os.name == "nt":
+        subprocess.run(f"taskkill /F /T /PID {process.pid}", shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        os.killpg(process.pid, signal.SIGTERM)
+    process.wait()
+
+# --- Sharded run ----------------------------------------------------------
+
+async def _run_shard(index, total, specs, report_path):
+    env = dict(os.environ, PLAYWRIGHT_JSON_OUTPUT_NAME=report_path, PLAYWRIGHT_BASE_URL=BASE_URL)
+    # One worker per shard: the shards themselves are the parallelism
+    cmd = f"npx playwright test {' '.join(specs)} --shard={index}/{total} --workers=1 --reporter=json --pass-with-no-tests"
+    process = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=PROJECT_ROOT,
+        env=env
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stderr.decode(errors='replace')
+
+def _walk_specs(suite, file_name=None):
+    file_name = suite.get("file", file_name)
+    for spec in suite.get("specs", []):
+        yield spec.get("file", file_name), spec
+    for child in suite.get("suites", []):
+        yield from _walk_specs(child, file_name)
+
+def merge_reports(report_paths):
+    """Merge per-shard JSON reports into {"passed", "specs", "errors"}."""
+    specs = {}
+    errors = []
+    for path in report_paths:
+        if not os.path.exists(path):
+            errors.append(f"Missing shard report: {os.path.basename(path)}")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        errors.extend(err.get("message", str(err)) for err in report.get("errors", []))
+        for suite in report.get("suites", []):
+            for file_name, spec in _walk_specs(suite):
+                for test in spec.get("tests", []):
+                    key = f"{file_name} > {spec['title']} [{test.get('projectName', '')}]"
+                    results = test.get("results", [])
+                    specs[key] = {
+                        "ok": test.get("status") in ("expected", "flaky", "skipped"),
+                        "duration_ms": sum(r.get("duration", 0) for r in results),
+                        "error": next((r["error"].get("message", "") for r in results if r.get("error")), None),
+                    }
+    passed = not errors and all(s["ok"] for s in specs.values())
+    return {"passed": passed, "specs": specs, "errors": errors}
+
+async def run_sharded_async(specs=None, shards=None):
+    specs = specs or []
+    total = plan_shards(shards, count_tests(specs))
+    server = start_server()
+    report_dir = tempfile.mkdtemp(prefix="pw-shards-")
+    try:
+        report_paths = [os.path.join(report_dir, f"shard-{i}.json") for i in range(1, total + 1)]
+        outcomes = await asyncio.gather(*[
+            _run_shard(i, total, specs, report_paths[i - 1]) for i in range(1, total + 1)
+        ])
+        merged = merge_reports(report_paths)
+        # A shard can crash before writing any test results
+        for i, (code, stderr) in enumerate(outcomes, 1):
+            if code != 0 and merged["passed"]:
+                merged["passed"] = False
+                merged["errors"].append(f"Shard {i}/{total} exited with {code}: {stderr.strip()[-500:]}")
+        merged["shards"] = total
+        record_history(merged["specs"])
+        return merged
+    finally:
+        stop_server(server)
+        shutil.rmtree(report_dir, ignore_errors=True)
+
+def run_sharded(specs=None, shards=None):
+    return asyncio.run(run_sharded_async(specs, shards))
+
+# --- Duration history -----------------------------------------------------
+
+def record_history(specs):
+    history = {}
+    if os.path.exists(HISTORY_FILE):
+        try:
+            with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            history = {}
+    for key, spec in specs.items():
+        history[key] = (history.get(key, []) + [spec["duration_ms"]])[-HISTORY_RUNS:]
+    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+def slowest_specs(limit=10):
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        history = json.load(f)
+    averages = [(key, sum(d) / len(d)) for key, d in history.items() if d]
+    return sorted(averages, key=lambda item: item[1], reverse=True)[:limit]
+
+def print_report(result):
+    for key, spec in sorted(result["specs"].items(), key=lambda item: -item[1]["duration_ms"]):
+        icon = "✅" if spec["ok"] else "❌"
+        print(f"   {icon} {spec['duration_ms'] / 1000:6.1f}s  {key}")
+        if spec["error"]:
+            print(f"      {spec['error'].strip()[:500]}")
+    for err in result["errors"]:
+        print(f"   ❌ {err[:500]}")
+
+if __name__ == "__main__":
+    # Usage: python playwright_shards.py [spec ...] [--shards N] [--slowest]
+    args = sys.argv[1:]
+    if "--slowest" in args:
+        print("🐢 Slowest specs (average over recorded runs):")
+        for key, avg in slowest_specs():
+            print(f"   {avg / 1000:6.1f}s  {key}")
+        exit(0)
+
+    shards = None
+    if "--shards" in args:
+        i = args.index("--shards")
+        shards = int(args[i + 1])
+        del args[i:i + 2]
+
+    print(f"🎭 Running Playwright in up to {plan_shards(shards)} shards...")
+    result = run_sharded(args, shards)
+    print_report(result)
+    if result["passed"]:
+        print(f"\n✅ {len(result['specs'])} specs passed across {result['shards']} shards.")
+        exit(0)
+    print("\n🚨 E2E run failed.")
+    exit(1)
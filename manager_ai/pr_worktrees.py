@@ -0,0 +1,220 @@
+import os
+import sys
+import shutil
+import hashlib
+import asyncio
+import logging
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # site/manager_ai
+PROJECT_ROOT = os.path.dirname(BASE_DIR)                 # site
+MANAGER_REL = os.path.relpath(BASE_DIR, PROJECT_ROOT)
+# Worktrees live NEXT TO the checkout, not inside it: tsconfig includes **/*.ts,
+# so nested worktrees would be type-checked by the main build.
+WORKTREES_DIR = os.getenv(
+    "PR_WORKTREES_DIR",
+    os.path.join(os.path.dirname(PROJECT_ROOT), f"{os.path.basename(PROJECT_ROOT)}-worktrees")
+)
+
+# Rough peak RSS of `next build` + lint running side by side in one worktree
+MEM_PER_SLOT_GB = 2
+
+# Pre-merge checks run inside each PR worktree (paths are relative to the worktree).
+# "env" is added to the check's environment.
+VERIFY_CHECKS = [
+    {"name": "Schema Integrity", "cmd": f"python {MANAGER_REL}/validate_queries.py"},
+    {"name": "Backend Functions", "cmd": f"python {MANAGER_REL}/check_functions.py"},
+    {"name": "Linting", "cmd": "npm run lint"},
+    # Same budgets as the health check, with growth measured against the main
+    # checkout's last passing build
+    {"name": "Build", "cmd": f"python {MANAGER_REL}/bundle_size.py --no-record",
+     "env": {"BUNDLE_HISTORY_FILE": os.path.join(BASE_DIR, "bundle_history.json")}},
+]
+
+# Environment for the PR's own code (checks, npm install scripts). The head is
+# unmerged and untrusted, so it never sees the bot's tokens: only what node,
+# npm and the build need, plus the public NEXT_PUBLIC_* build settings.
+UNTRUSTED_ENV_KEYS = ("PATH", "HOME", "LANG", "TMPDIR", "TEMP", "TMP", "SYSTEMROOT", "CI")
+UNTRUSTED_ENV_PREFIXES = ("NODE_", "NPM_CONFIG_", "npm_config_", "NEXT_PUBLIC_")
+
+# Hash of the package.json/package-lock.json a slot's node_modules was installed from
+DEPS_MARKER = os.path.join("node_modules", ".manager_ai_deps")
+
+logger = logging.getLogger("ManagerAI")
+
+def untrusted_env():
+    return {
+        key: value for key, value in os.environ.items()
+        if key in UNTRUSTED_ENV_KEYS or key.startswith(UNTRUSTED_ENV_PREFIXES)
+    }
+
+def _dependency_key(root):
+    digest = hashlib.sha256()
+    for name in ("package.json", "package-lock.json"):
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def default_parallelism():
+    """How many worktrees may verify at once, bounded by cores and physical memory."""
+    override = os.getenv("PR_VERIFY_PARALLEL")
+    if override:
+        return max(1, int(override))
+
+    by_cpu = max(1, (os.cpu_count() or 1) // 2)
+    try:
+        mem_gb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 ** 3)
+        by_mem = max(1, int(mem_gb // MEM_PER_SLOT_GB))
+    except (AttributeError, ValueError, OSError):
+        by_mem = by_cpu  # sysconf is unavailable on Windows
+    return min(by_cpu, by_mem)
+
+def _link_tree(src, dst):
+    """Copy a directory as hardlinks so the worktree shares the warm node_modules."""
+    def link_or_copy(s, d):
+        try:
+            os.link(s, d)
+        except OSError:
+            shutil.copy2(s, d)
+    shutil.copytree(src, dst, symlinks=True, copy_function=link_or_copy)
+
+async def _run(cmd, cwd, env=None):
+    process = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=env
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode(errors='replace') + stderr.decode(errors='replace')
+
+class WorktreePool:
+    """A fixed set of git worktrees that are recycled between PR verifications.
+
+    All worktrees share the main checkout's object store, so checking out a PR
+    head only needs a fetch of the new objects.
+    """
+
+    def __init__(self, size=None):
+        self.size = size or default_parallelism()
+        self._slots = None
+        self._setup_lock = asyncio.Lock()
+        self._fetch_lock = asyncio.Lock()
+
+    async def _ensure_slots(self):
+        # Concurrent first callers wait for one setup; the queue is published only
+        # once every slot exists, so a failed setup is retried by the next caller
+        # instead of leaving an empty queue that blocks forever.
+        async with self._setup_lock:
+            if self._slots is not None:
+                return
+            slots = asyncio.Queue()
+            os.makedirs(WORKTREES_DIR, exist_ok=True)
+            # Forget registered worktrees whose directories were deleted
+            await _run("git worktree prune", PROJECT_ROOT)
+            loop = asyncio.get_running_loop()
+            for i in range(self.size):
+                path = os.path.join(WORKTREES_DIR, f"slot-{i}")
+                if not os.path.exists(path):
+                    code, out = await _run(f'git worktree add --detach "{path}"', PROJECT_ROOT)
+                    if code != 0:
+                        raise RuntimeError(f"git worktree add failed: {out.strip()[:300]}")
+                    # Copying node_modules and .next/cache takes seconds; keep it off the event loop
+                    await loop.run_in_executor(None, self._seed_caches, path)
+                slots.put_nowait(path)
+            self._slots = slots
+
+    def _seed_caches(self, path):
+        """Warm a fresh worktree with the main checkout's dependencies and build cache."""
+        node_modules = os.path.join(PROJECT_ROOT, "node_modules")
+        if os.path.isdir(node_modules):
+            _link_tree(node_modules, os.path.join(path, "node_modules"))
+            with open(os.path.join(path, DEPS_MARKER), 'w') as f:
+                f.write(_dependency_key(PROJECT_ROOT))
+        # The build rewrites its cache, so it gets a private copy rather than hardlinks
+        next_cache = os.path.join(PROJECT_ROOT, ".next", "cache")
+        if os.path.isdir(next_cache):
+            shutil.copytree(next_cache, os.path.join(path, ".next", "cache"), symlinks=True)
+
+    async def _checkout(self, path, pr_number, head_sha):
+        # Fetches write to the shared object store, so they go one at a time
+        async with self._fetch_lock:
+            code, out = await _run(f"git fetch --no-tags origin +refs/pull/{pr_number}/head", PROJECT_ROOT)
+        if code != 0:
+            raise RuntimeError(f"git fetch failed: {out.strip()[:300]}")
+        for cmd in (f"git checkout --detach --force {head_sha}", "git clean -ffdx -e node_modules -e .next"):
+            code, out = await _run(cmd, path)
+            if code != 0:
+                raise RuntimeError(f"{cmd} failed: {out.strip()[:300]}")
+
+    async def _sync_dependencies(self, path):
+        """Reinstall node_modules when the PR's package files differ from the ones
+        the slot was installed from. Returns (ok, log)."""
+        wanted = _dependency_key(path)
+        marker = os.path.join(path, DEPS_MARKER)
+        if os.path.exists(marker):
+            with open(marker, 'r') as f:
+                if f.read().strip() == wanted:
+                    return True, ""
+        has_lock = os.path.exists(os.path.join(path, "package-lock.json"))
+        cmd = "npm ci --no-audit --no-fund" if has_lock else "npm install --no-audit --no-fund"
+        logger.info(f"   📦 Dependencies changed in {os.path.basename(path)}; running {cmd.split()[1]}...")
+        # npm ci removes node_modules first, so hardlinks into the main checkout are not written through
+        code, out = await _run(cmd, path, untrusted_env())
+        if code != 0:
+            return False, out
+        with open(marker, 'w') as f:
+            f.write(wanted)
+        return True, out
+
+    async def verify(self, pr_number, head_sha):
+        """Run VERIFY_CHECKS against the PR head. Returns (passed, {check name: log tail})."""
+        await self._ensure_slots()
+        path = await self._slots.get()
+        try:
+            logger.info(f"   🌳 [Sub-Bot-PR#{pr_number}] Verifying {head_sha[:7]} in {os.path.basename(path)}...")
+            await self._checkout(path, pr_number, head_sha)
+            installed, install_log = await self._sync_dependencies(path)
+            if not installed:
+                return False, {"Dependencies": install_log[-1500:]}
+            env = untrusted_env()
+            results = await asyncio.gather(*[
+                _run(check["cmd"], path, dict(env, **check.get("env", {}))) for check in VERIFY_CHECKS
+            ])
+            failures = {
+                check["name"]: out[-1500:]
+                for check, (code, out) in zip(VERIFY_CHECKS, results) if code != 0
+            }
+            return not failures, failures
+        finally:
+            self._slots.put_nowait(path)
+
+async def verify_many(prs, size=None):
+    """Verify several (pr_number, head_sha) pairs concurrently."""
+    pool = WorktreePool(size)
+    results = await asyncio.gather(*[pool.verify(n, sha) for n, sha in prs])
+    return dict(zip([n for n, _ in prs], results))
+
+if __name__ == "__main__":
+    # Usage: python pr_worktrees.py <pr_number>:<head_sha> [...]
+    if len(sys.argv) < 2:
+        print("Usage: python pr_worktrees.py <pr_number>:<head_sha> [...]")
+        exit(1)
+
+    targets = [(int(arg.split(":")[0]), arg.split(":")[1]) for arg in sys.argv[1:]]
+    print(f"🌳 Verifying {len(targets)} PRs with up to {default_parallelism()} worktrees...")
+    outcome = asyncio.run(verify_many(targets))
+
+    exit_code = 0
+    for number, (passed, failures) in outcome.items():
+        if passed:
+            print(f"✅ PR #{number}: all checks passed.")
+        else:
+            exit_code = 1
+            print(f"❌ PR #{number}: failed {', '.join(failures)}")
+            for name, log_tail in failures.items():
+                print(f"--- {name} ---\n{log_tail}")
+    exit(exit_code)
@@ -0,0 +1,114 @@
+import os
+import re
+import json
+import time
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Local to each bot: it is not shared through the lease store. With several
+# workers, !status only shows the PRs this worker reviewed, and two workers
+# sharing one checkout may lose each other's updates (load-modify-save).
+# Which PRs get reviewed is decided by leases, not by this file.
+STATE_FILE = os.path.join(BASE_DIR, "review_state.json")
+
+# Verdicts parsed out of the SYSTEM_PROMPT_REVIEW output
+VERDICT_YES = "YES"
+VERDICT_NO = "NO"
+VERDICT_UNKNOWN = "UNKNOWN"
+
+def load_review_state():
+    """Load the materialized per-PR review state written by the background loop."""
+    if not os.path.exists(STATE_FILE):
+        return {}
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_review_state(state):
+    """Write the state atomically so !status never reads a half-written file."""
+    tmp_path = STATE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_FILE)
+
+def parse_review(ai_review):
+    """Extract (score, verdict) from an AI review."""
+    score = None
+    score_match = re.search(r"Quality Score\**\s*:?\**\s*\(?(\d{1,3})", ai_review, re.IGNORECASE)
+    if score_match:
+        score = int(score_match.group(1))
+
+    verdict = VERDICT_UNKNOWN
+    if re.search(r"Safe to Merge:\s*YES", ai_review, re.IGNORECASE):
+        verdict = VERDICT_YES
+    elif re.search(r"Safe to Merge:\s*NO", ai_review, re.IGNORECASE):
+        verdict = VERDICT_NO
+    return score, verdict
+
+def state_key(repo_name, number):
+    return f"{repo_name}#{number}"
+
+def record_review(repo_name, number, title, url, head_sha, ai_review, merge_outcome):
+    """Store the outcome of one PR review. merge_outcome: merged / blocked
+    (conflicts or failed verification, final for this head) / failed
+    (transient, retried) / skipped."""
+    score, verdict = parse_review(ai_review)
+    state = load_review_state()
+    state[state_key(repo_name, number)] = {
+        "repo": repo_name,
+        "number": number,
+        "title": title,
+        "url": url,
+        "head_sha": head_sha,
+        "score": score,
+        "verdict": verdict,
+        "merge_outcome": merge_outcome,
+        "reviewed_at": time.time(),
+    }
+    save_review_state(state)
+
+def is_up_to_date(repo_name, number, head_sha, state=None):
+    """True if this PR was already reviewed at its current head SHA. A failed
+    merge (checks pending, GitHub 5xx, mergeability not computed yet) is
+    transient, so those PRs stay due for another attempt; a blocked one is not."""
+    if state is None:
+        state = load_review_state()
+    entry = state.get(state_key(repo_name, number))
+    return bool(entry) and entry.get("head_sha") == head_sha and entry.get("merge_outcome") != "failed"
+
+def prune_closed(repo_name, open_numbers):
+    """Drop this repository's entries for PRs that are no longer open, and
+    entries from before state was keyed by repository."""
+    state = load_review_state()
+    keep = {state_key(repo_name, n) for n in open_numbers}
+    pruned = {
+        k: v for k, v in state.items()
+        if "repo" in v and (v["repo"] != repo_name or k in keep)
+    }
+    if len(pruned) != len(state):
+        save_review_state(pruned)
+
+def render_status(state=None):
+    """Render the materialized state as a short Discord-friendly summary."""
+    if state is None:
+        state = load_review_state()
+    if not state:
+        return "No open PRs found."
+
+    icons = {VERDICT_YES: "✅", VERDICT_NO: "❌", VERDICT_UNKNOWN: "❔"}
+    lines = []
+    for entry in sorted(state.values(), key=lambda e: (e.get("repo", ""), e["number"])):
+        score = entry["score"] if entry["score"] is not None else "?"
+        age_min = int((time.time() - entry["reviewed_at"]) / 60)
+        lines.append(
+            f"{icons.get(entry['verdict'], '❔')} **{entry.get('repo', '')} PR #{entry['number']}**: {entry['title']}\n"
+            f"   Score: {score}/100 | Merge: {entry['merge_outcome']} | "
+            f"Head: `{entry['head_sha'][:7]}` | Reviewed {age_min}m ago\n"
+            f"   {entry['url']}"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    print(render_status())
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+SPANS_FILE = os.path.join(LOG_DIR, "spans.jsonl")
+
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Current trace (one per health cycle or Discord command) and innermost span.
+# contextvars follow asyncio tasks, so PR sub-bots started with gather() nest
+# under the cycle that launched them.
+_trace_id = contextvars.ContextVar("trace_id", default=None)
+_span_id = contextvars.ContextVar("span_id", default=None)
+
+span_logger = logging.getLogger("ManagerAI.spans")
+
+class TraceContextFilter(logging.Filter):
+    """Stamps every record with the active trace/span ids before it is queued."""
+
+    def filter(self, record):
+        record.trace_id = _trace_id.get() or "-"
+        record.span_id = _span_id.get() or "-"
+        return True
+
+class SpanRecordFilter(logging.Filter):
+    def __init__(self, spans_only):
+        super().__init__()
+        self.spans_only = spans_only
+
+    def filter(self, record):
+        return hasattr(record, "span") == self.spans_only
+
+class SpanJsonFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.span, default=str)
+
+def setup_logging(level=logging.INFO):
+    """Route all logging through a queue so the event loop only pays for an
+    enqueue; a listener thread writes console lines and rotating span files."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(trace_id)s/%(span_id)s | %(message)s'))
+    console.addFilter(SpanRecordFilter(spans_only=False))
+
+    spans = RotatingFileHandler(SPANS_FILE, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding='utf-8')
+    spans.setFormatter(SpanJsonFormatter())
+    spans.addFilter(SpanRecordFilter(spans_only=True))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, console, spans, respect_handler_level=True)
+    listener.start()
+    # Flushes whatever is still queued when the bot exits
+    atexit.register(listener.stop)
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block as a span. Yields a dict the block can add attributes to.
+    A span opened with no active trace starts a new one."""
+    trace_token = None
+    if _trace_id.get() is None:
+        trace_token = _trace_id.set(uuid.uuid4().hex[:12])
+    parent = _span_id.get()
+    span_id = uuid.uuid4().hex[:8]
+    span_token = _span_id.set(span_id)
+
+    started_at = time.time()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield attrs
+    except BaseException as e:
+        status = "error"
+        attrs["error"] = repr(e)[:200]
+        raise
+    finally:
+        record = {
+            "trace": _trace_id.get(),
+            "span": span_id,
+            "parent": parent,
+            "name": name,
+            "start": round(started_at, 3),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "status": status,
+            "attrs": attrs,
+        }
+        span_logger.info(name, extra={"span": record})
+        _span_id.reset(span_token)
+        if trace_token is not None:
+            _trace_id.reset(trace_token)
+
+# --- Summary CLI ------------------------------------------------------------
+
+def read_spans(path=SPANS_FILE):
+    """Read the current span file and its rotated backups, oldest first."""
+    paths = [f"{path}.{i}" for i in range(BACKUP_COUNT, 0, -1)] + [path]
+    spans = []
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        with open(p, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+def summarize(spans, cycles=5, top=5):
+    traces = {}
+    for s in spans:
+        traces.setdefault(s["trace"], []).append(s)
+
+    lines = []
+    recent = sorted(traces.values(), key=lambda t: min(s["start"] for s in t))[-cycles:]
+    for trace in recent:
+        root = next((s for s in trace if s["parent"] is None), max(trace, key=lambda s: s["duration_ms"]))
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(root["start"]))
+        lines.append(f"🧵 {root['trace']} {root['name']} @ {started}: {root['duration_ms'] / 1000:.1f}s, {len(trace)} spans")
+        for s in sorted((s for s in trace if s is not root), key=lambda s: -s["duration_ms"])[:top]:
+            detail = ", ".join(f"{k}={v}" for k, v in s["attrs"].items() if k != "error")
+            icon = "❌" if s["status"] == "error" else "  "
+            lines.append(f"   {icon} {s['duration_ms'] / 1000:7.2f}s  {s['name']}" + (f" ({detail})" if detail else ""))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    # Usage: python tracing.py [--cycles N] [--top N]
+    args = sys.argv[1:]
+    cycles = int(args[args.index("--cycles") + 1]) if "--cycles" in args else 5
+    top = int(args[args.index("--top") + 1]) if "--top" in args else 5
+    spans = read_spans()
+    if not spans:
+        print(f"No spans recorded yet in {SPANS_FILE}.")
+        exit(0)
+    print(summarize(spans, cycles, top))
@@ -1,8 +1,8 @@
 import os
 import json
-import subprocess
 import asyncio
 from bot import call_openrouter, create_github_issue, SYSTEM_PROMPT_TASK
+from playwright_shards import run_sharded, print_report
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,18 +12,15 @@ SNAPSHOT_FILE = os.path.join(BASE_DIR, "ux_snapshots.json")
 def run_ux_dump():
     print("📸 Capturing UX Snapshots via Playwright...")
     try:
-        subprocess.run(
-            "npx playwright test tests/e2e/ux-dump.spec.js",
-            shell=True,
-            cwd=PROJECT_ROOT,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Snapshot capture failed: {e.stderr.decode()}")
+        result = run_sharded(["tests/e2e/ux-dump.spec.js"])
+    except RuntimeError as e:
+        print(f"❌ Snapshot capture failed: {e}")
         return False
+    if not result["passed"]:
+        print("❌ Snapshot capture failed:")
+        print_report(result)
+        return False
+    return True
 
 async def analyze_page(url, data):
     print(f"🤖 [Sub-Bot-{url}] Analyzing {url}...")
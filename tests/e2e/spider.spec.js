@@ -1,4 +1,6 @@
 import { test, expect } from '@playwright/test';
+import fs from 'fs';
+import path from 'path';
 
 // Universal Crawler / Fuzzer
 // Goals:
@@ -6,8 +8,13 @@ import { test, expect } from '@playwright/test';
 // 2. Click all buttons.
 // 3. LISTEN for Console Errors and Network Failures.
 
+// Interactive pages found by the HTTP pre-pass (manager_ai/link_crawler.py).
+// Static pages are already covered there, so the browser budget goes to forms.
+const SEEDS_FILE = path.join(process.cwd(), 'tests', 'e2e', 'spider_seeds.json');
+const crawlerSeeds = fs.existsSync(SEEDS_FILE) ? JSON.parse(fs.readFileSync(SEEDS_FILE, 'utf-8')) : [];
+
 const visited = new Set();
-const queue = ['/', '/pricing', '/vault', '/properties/create']; // Explicitly seed deep pages
+const queue = [...crawlerSeeds, '/', '/pricing', '/vault', '/properties/create']; // Explicitly seed deep pages
 const MAX_PAGES = 15;
 
 test.describe('Autonomous Spider 🕷️', () => {